@@ -0,0 +1,228 @@
+"""
+에이전트 호출 계측
+
+에이전트를 호출할 때마다 입력/출력 토큰, 모델 지연 시간, 도구별 호출 수·오류 수·소요 시간, 전체 소요 시간을
+단계(stage)와 매물(listing) 태그와 함께 기록합니다. 값은 AgentResult.metrics(EventLoopMetrics)에서 가져옵니다.
+실행 단위로 집계(summary)하고, JSON Lines 파일과 Prometheus 텍스트 형식(/metrics)으로 내보냅니다.
+
+하위 에이전트를 호출하는 코드는 run_agent()를 사용하면 활성화된 MetricsRecorder에 자동으로 기록됩니다.
+"""
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+import agent_progress
+
+_active: Optional["MetricsRecorder"] = None
+
+
+async def run_agent(name: str, agent, prompt: str, stage: str = "", listing: str = ""):
+    """
+    에이전트를 호출하고(진행 이벤트 스트리밍 포함) 활성화된 MetricsRecorder에 호출 결과를 기록
+    """
+    recorder = _active
+    started = time.perf_counter()
+    try:
+        result = await agent_progress.run_agent(name, agent, prompt)
+    except Exception as e:
+        if recorder:
+            recorder.record(name, agent, None, time.perf_counter() - started, stage, listing, error=e)
+        raise
+    if recorder:
+        recorder.record(name, agent, result, time.perf_counter() - started, stage, listing)
+    return result
+
+
+def _model_id(agent) -> str:
+    config = getattr(getattr(agent, "model", None), "config", None) or {}
+    return config.get("model_id", "") if isinstance(config, dict) else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _load_prices() -> Dict[str, Tuple[float, float]]:
+    """
+    환경변수 AGENT_TOKEN_PRICES: {"모델 ID": [입력, 출력, 캐시 읽기, 캐시 쓰기] 100만 토큰당 USD}
+    캐시 단가를 생략하면 캐시 토큰은 비용에 포함하지 않음
+    """
+    return {model_id: tuple(price) for model_id, price in json.loads(os.getenv("AGENT_TOKEN_PRICES", "{}")).items()}
+
+
+class MetricsRecorder:
+    def __init__(self, metrics_file: Optional[str] = None, prices: Optional[Dict[str, Tuple[float, float]]] = None):
+        """
+        Args:
+            metrics_file: 호출별 레코드를 추가할 JSONL 파일 경로 (생략하면 메모리에만 보관)
+            prices: {모델 ID: (입력, 출력[, 캐시 읽기, 캐시 쓰기]) 100만 토큰당 USD} 비용 계산용 (기본값: 환경변수 AGENT_TOKEN_PRICES)
+        """
+        self.run_id = uuid.uuid4().hex[:12]
+        self.metrics_file = metrics_file
+        self.prices = _load_prices() if prices is None else prices
+        self.records: List[Dict] = []
+        self._lock = threading.Lock()
+
+    def activate(self) -> "MetricsRecorder":
+        """
+        run_agent()가 이 레코더에 기록하도록 등록
+        """
+        global _active
+        _active = self
+        return self
+
+    def close(self) -> None:
+        global _active
+        if _active is self:
+            _active = None
+
+    def record(self, name: str, agent, result, elapsed_s: float, stage: str = "", listing: str = "",
+               error: Optional[Exception] = None) -> Dict:
+        metrics = getattr(result, "metrics", None)
+        usage = getattr(metrics, "accumulated_usage", None) or {}
+        model_metrics = getattr(metrics, "accumulated_metrics", None) or {}
+        tools = {
+            tool_name: {
+                "calls": tool.call_count,
+                "errors": tool.error_count,
+                "time_s": round(tool.total_time, 3),
+            }
+            for tool_name, tool in (getattr(metrics, "tool_metrics", None) or {}).items()
+        }
+
+        model_id = _model_id(agent)
+        record = {
+            "ts": datetime.now().isoformat(timespec="milliseconds"),
+            "run_id": self.run_id,
+            "agent": name,
+            "stage": stage or name,
+            "listing": listing or "",
+            "model_id": model_id,
+            "success": error is None,
+            "error": f"{type(error).__name__}: {error}" if error else None,
+            "elapsed_s": round(elapsed_s, 3),
+            "input_tokens": usage.get("inputTokens", 0),
+            "output_tokens": usage.get("outputTokens", 0),
+            "cache_read_tokens": usage.get("cacheReadInputTokens", 0),
+            "cache_write_tokens": usage.get("cacheWriteInputTokens", 0),
+            "model_latency_s": round(model_metrics.get("latencyMs", 0) / 1000, 3),
+            "cycles": getattr(metrics, "cycle_count", 0),
+            "tool_calls": sum(tool["calls"] for tool in tools.values()),
+            "tool_errors": sum(tool["errors"] for tool in tools.values()),
+            "tool_time_s": round(sum(tool["time_s"] for tool in tools.values()), 3),
+            "tools": tools,
+        }
+        if model_id in self.prices:
+            prices = self.prices[model_id]
+            tokens = [record["input_tokens"], record["output_tokens"],
+                      record["cache_read_tokens"], record["cache_write_tokens"]]
+            record["cost_usd"] = round(sum(count * price for count, price in zip(tokens, prices)) / 1_000_000, 6)
+
+        with self._lock:
+            self.records.append(record)
+            if self.metrics_file:
+                with open(self.metrics_file, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        return record
+
+    def summary(self) -> Dict:
+        """
+        실행 전체와 단계별 합계 (호출 수, 오류 수, 토큰, 소요 시간, 모델/도구 지연 시간, 비용)
+        """
+        fields = ["calls", "errors", "input_tokens", "output_tokens", "cache_read_tokens", "cache_write_tokens",
+                  "elapsed_s", "model_latency_s", "tool_calls", "tool_errors", "tool_time_s", "cost_usd"]
+        total = dict.fromkeys(fields, 0)
+        stages: Dict[str, Dict] = {}
+        with self._lock:
+            records = list(self.records)
+        for record in records:
+            for entry in (total, stages.setdefault(record["stage"], dict.fromkeys(fields, 0))):
+                entry["calls"] += 1
+                entry["errors"] += not record["success"]
+                for field in fields[2:]:
+                    entry[field] += record.get(field, 0)
+        for entry in [total, *stages.values()]:
+            for field in ("elapsed_s", "model_latency_s", "tool_time_s", "cost_usd"):
+                entry[field] = round(entry[field], 6 if field == "cost_usd" else 3)
+        return {"run_id": self.run_id, "total": total, "stages": stages}
+
+    def prometheus_text(self) -> str:
+        """
+        단계별 누적 지표를 Prometheus 텍스트 형식으로 변환
+        """
+        with self._lock:
+            records = list(self.records)
+
+        counters: Dict[Tuple[str, Tuple], float] = {}
+
+        def add(metric: str, labels: Dict[str, str], value: float) -> None:
+            key = (metric, tuple(sorted(labels.items())))
+            counters[key] = counters.get(key, 0) + value
+
+        for record in records:
+            labels = {"run_id": record["run_id"], "stage": record["stage"]}
+            add("agent_invocations_total", {**labels, "status": "ok" if record["success"] else "error"}, 1)
+            add("agent_tokens_total", {**labels, "type": "input"}, record["input_tokens"])
+            add("agent_tokens_total", {**labels, "type": "output"}, record["output_tokens"])
+            add("agent_tokens_total", {**labels, "type": "cache_read"}, record["cache_read_tokens"])
+            add("agent_tokens_total", {**labels, "type": "cache_write"}, record["cache_write_tokens"])
+            add("agent_invocation_seconds_sum", labels, record["elapsed_s"])
+            add("agent_invocation_seconds_count", labels, 1)
+            add("agent_model_latency_seconds_sum", labels, record["model_latency_s"])
+            add("agent_cost_usd_total", labels, record.get("cost_usd", 0))
+            for tool_name, tool in record["tools"].items():
+                tool_labels = {**labels, "tool": tool_name}
+                add("agent_tool_calls_total", {**tool_labels, "status": "ok"}, tool["calls"] - tool["errors"])
+                add("agent_tool_calls_total", {**tool_labels, "status": "error"}, tool["errors"])
+                add("agent_tool_seconds_sum", tool_labels, tool["time_s"])
+
+        descriptions = {
+            "agent_invocations_total": ("counter", "Agent invocations by stage and status"),
+            "agent_tokens_total": ("counter", "Model tokens by stage and type"),
+            "agent_invocation_seconds": ("summary", "Wall-clock time per agent invocation"),
+            "agent_model_latency_seconds_sum": ("counter", "Model latency reported by the provider"),
+            "agent_cost_usd_total": ("counter", "Estimated model cost (AGENT_TOKEN_PRICES)"),
+            "agent_tool_calls_total": ("counter", "Tool calls made by agents"),
+            "agent_tool_seconds_sum": ("counter", "Time spent in tool calls"),
+        }
+        lines = []
+        for family, (kind, help_text) in descriptions.items():
+            samples = [(key, value) for key, value in counters.items() if key[0].startswith(family)]
+            if not samples:
+                continue
+            lines.append(f"# HELP {family} {help_text}")
+            lines.append(f"# TYPE {family} {kind}")
+            for (metric, labels), value in sorted(samples):
+                label_text = ",".join(f'{key}="{_escape(value)}"' for key, value in labels)
+                lines.append(f"{metric}{{{label_text}}} {round(value, 6):g}")
+        return "\n".join(lines) + "\n"
+
+    def serve_prometheus(self, host: str = "127.0.0.1", port: int = 9464) -> ThreadingHTTPServer:
+        """
+        GET /metrics 로 prometheus_text()를 제공하는 HTTP 서버를 백그라운드 스레드로 실행 (종료: shutdown())
+        """
+        recorder = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                body = recorder.prometheus_text().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
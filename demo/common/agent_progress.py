@@ -0,0 +1,239 @@
+"""
+에이전트 실행 진행 이벤트와 타임라인
+
+Strands Agent의 stream_async 이벤트를 받아 텍스트 델타, 모델 호출, 도구 호출 시작/종료, 하위 에이전트 경계를
+콘솔이나 SSE(Server-Sent Events)로 실시간 전달하고, 에이전트/모델/도구 호출별 구간(span)을 타임라인 파일로 저장합니다.
+타임라인 파일의 traceEvents는 Chrome Trace Event 형식이므로 Perfetto(ui.perfetto.dev)에서 바로 열어볼 수 있습니다.
+
+하위 에이전트를 호출하는 코드는 run_agent()를 사용하면, 활성화된 ProgressTracker가 있을 때만 스트리밍으로 실행됩니다.
+"""
+import asyncio
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+_active: Optional["ProgressTracker"] = None
+
+
+async def run_agent(name: str, agent, prompt: str):
+    """
+    활성화된 ProgressTracker가 있으면 스트리밍으로 이벤트를 기록하며, 없으면 invoke_async로 에이전트를 호출
+    """
+    tracker = _active
+    if tracker is None:
+        return await agent.invoke_async(prompt)
+    return await tracker.stream(name, agent, prompt)
+
+
+class ConsoleSink:
+    def __init__(self, show_text: bool = False, out=sys.stdout):
+        """
+        Args:
+            show_text: 모델 응답 텍스트 델타도 출력 (여러 에이전트가 동시에 실행되면 텍스트가 섞일 수 있음)
+            out: 출력 스트림
+        """
+        self.show_text = show_text
+        self.out = out
+
+    def __call__(self, event: Dict) -> None:
+        if event["type"] == "text":
+            if self.show_text:
+                self.out.write(event["data"])
+                self.out.flush()
+            return
+
+        line = f"[{event['elapsed_s']:8.2f}s] {event['agent']:<20} {event['type']:<12} {event['name']}"
+        if "duration_s" in event:
+            line += f" ({event['duration_s']:.2f}s{'' if event.get('status', 'ok') == 'ok' else ', ' + event['status']})"
+        print(("\n" if self.show_text else "") + line, file=self.out, flush=True)
+
+
+class ProgressTracker:
+    def __init__(self, sinks: Optional[List[Callable[[Dict], None]]] = None, timeline_file: Optional[str] = None):
+        """
+        Args:
+            sinks: 이벤트를 받을 함수 목록 (예: [ConsoleSink()])
+            timeline_file: close() 시 타임라인을 저장할 JSON 파일 경로 (생략하면 저장하지 않음)
+        """
+        self.sinks = list(sinks or [])
+        self.timeline_file = timeline_file
+        self.spans: List[Dict] = []
+        self.started_at = datetime.now()
+        self.origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._subscribers: List[tuple] = []
+
+    def activate(self) -> "ProgressTracker":
+        """
+        run_agent()가 이 트래커를 사용하도록 등록
+        """
+        global _active
+        _active = self
+        return self
+
+    def close(self) -> None:
+        """
+        등록을 해제하고 타임라인 파일 저장
+        """
+        global _active
+        if _active is self:
+            _active = None
+        if self.timeline_file:
+            self.write_timeline(self.timeline_file)
+
+    def _elapsed(self) -> float:
+        return round(time.perf_counter() - self.origin, 3)
+
+    def emit(self, type: str, agent: str, name: str = "", **data: Any) -> None:
+        event = {"ts": datetime.now().isoformat(timespec="milliseconds"), "elapsed_s": self._elapsed(),
+                 "type": type, "agent": agent, "name": name, **data}
+        for sink in self.sinks:
+            sink(event)
+        # 다른 스레드(동기 도구)에서 발생한 이벤트도 SSE 구독자의 이벤트 루프로 전달
+        for loop, queue in list(self._subscribers):
+            loop.call_soon_threadsafe(queue.put_nowait, event)
+
+    def _record(self, agent: str, kind: str, name: str, start: float, end: float, **attrs: Any) -> float:
+        duration = round(end - start, 3)
+        with self._lock:
+            self.spans.append({
+                "agent": agent, "kind": kind, "name": name,
+                "start_s": round(start - self.origin, 3), "end_s": round(end - self.origin, 3),
+                "duration_s": duration, **attrs,
+            })
+        return duration
+
+    @contextmanager
+    def span(self, agent: str, kind: str, name: str = ""):
+        """
+        코드 블록을 하나의 구간으로 기록 (예: 파이프라인 노드)
+        """
+        self.emit(f"{kind}_start", agent, name)
+        started = time.perf_counter()
+        status = "ok"
+        try:
+            yield
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            duration = self._record(agent, kind, name, started, time.perf_counter(), status=status)
+            self.emit(f"{kind}_end", agent, name, duration_s=duration, status=status)
+
+    async def stream(self, name: str, agent, prompt: str):
+        """
+        agent.stream_async로 에이전트를 실행하면서 이벤트를 전달하고 구간을 기록한 뒤 최종 AgentResult를 반환
+        """
+        result = None
+        model_started = None
+        usage: Dict = {}
+        tools: Dict[str, tuple] = {}  # toolUseId → (도구 이름, 시작 시각)
+
+        with self.span(name, "agent", name):
+            async for event in agent.stream_async(prompt):
+                if "data" in event:
+                    self.emit("text", name, data=event["data"])
+
+                raw = event.get("event") or {}
+                if "messageStart" in raw:
+                    model_started = time.perf_counter()
+                    self.emit("model_start", name, "model")
+                elif "metadata" in raw:
+                    usage = raw["metadata"].get("usage", {})
+
+                message = event.get("message")
+                if message:
+                    if message.get("role") == "assistant" and model_started is not None:
+                        duration = self._record(name, "model", "model", model_started, time.perf_counter(),
+                                                input_tokens=usage.get("inputTokens"),
+                                                output_tokens=usage.get("outputTokens"))
+                        self.emit("model_end", name, "model", duration_s=duration, usage=usage)
+                        model_started, usage = None, {}
+
+                    # 모델 응답이 끝나면 요청된 도구가 실행되고, 도구 결과 메시지로 종료를 확인
+                    for content in message.get("content", []):
+                        if "toolUse" in content:
+                            tool_use = content["toolUse"]
+                            tools[tool_use["toolUseId"]] = (tool_use["name"], time.perf_counter())
+                            self.emit("tool_start", name, tool_use["name"])
+                        elif "toolResult" in content:
+                            tool_result = content["toolResult"]
+                            tool_name, started = tools.pop(tool_result["toolUseId"], ("tool", time.perf_counter()))
+                            status = tool_result.get("status", "success")
+                            duration = self._record(name, "tool", tool_name, started, time.perf_counter(), status=status)
+                            self.emit("tool_end", name, tool_name, duration_s=duration, status=status)
+
+                if "result" in event:
+                    result = event["result"]
+        return result
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue()
+        self._subscribers.append((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers = [(loop, q) for loop, q in self._subscribers if q is not queue]
+
+    async def serve_sse(self, host: str = "127.0.0.1", port: int = 8765):
+        """
+        GET /events 로 진행 이벤트를 SSE로 전달하는 서버를 백그라운드로 실행. 종료하려면 반환된 서버의 should_exit를 True로 설정
+        """
+        import uvicorn
+        from starlette.applications import Starlette
+        from starlette.responses import StreamingResponse
+        from starlette.routing import Route
+
+        async def events(request):
+            queue = self.subscribe()
+
+            async def body():
+                try:
+                    while True:
+                        event = await queue.get()
+                        payload = json.dumps(event, ensure_ascii=False, default=str)
+                        yield f"event: {event['type']}\ndata: {payload}\n\n"
+                finally:
+                    self.unsubscribe(queue)
+
+            return StreamingResponse(body(), media_type="text/event-stream")
+
+        server = uvicorn.Server(uvicorn.Config(
+            Starlette(routes=[Route("/events", events)]), host=host, port=port, log_level="warning"
+        ))
+        asyncio.create_task(server.serve())
+        return server
+
+    def timeline(self) -> Dict:
+        """
+        구간 목록과 Chrome Trace Event 형식의 traceEvents (에이전트별로 한 줄씩 표시)
+        """
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span["start_s"])
+        threads = {}
+        trace_events = []
+        for span in spans:
+            tid = threads.setdefault(span["agent"], len(threads) + 1)
+            trace_events.append({
+                "name": span["name"], "cat": span["kind"], "ph": "X", "pid": 1, "tid": tid,
+                "ts": round(span["start_s"] * 1_000_000), "dur": round(span["duration_s"] * 1_000_000),
+                "args": {key: value for key, value in span.items() if key not in ("agent", "kind", "name")},
+            })
+        trace_events.extend(
+            {"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": agent}}
+            for agent, tid in threads.items()
+        )
+        return {
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "total_s": self._elapsed(),
+            "spans": spans,
+            "traceEvents": trace_events,
+        }
+
+    def write_timeline(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.timeline(), f, ensure_ascii=False, indent=2)
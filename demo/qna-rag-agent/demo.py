@@ -1,5 +1,8 @@
 import os
+import sys
+import json
 import time
+import asyncio
 from datetime import datetime
 from typing import List, Literal
 from dotenv import load_dotenv
@@ -11,6 +14,11 @@ from strands import Agent
 from strands.models import BedrockModel
 from strands_tools import retrieve, http_request, file_read, file_write, editor
 
+# 데모 공통 모듈 (진행 이벤트/타임라인, 호출 계측)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+from agent_progress import ConsoleSink, ProgressTracker
+from agent_metrics import MetricsRecorder, run_agent
+
 
 class ChatbotResponse(BaseModel):
     """챗봇 응답 구조"""
@@ -198,15 +206,34 @@ def main():
     question = "튼튼머니를 적립하는 방식은 몇 가지가 있는지와, 각 방식 모두 설명해주세요."
     print(f"\n📝 질문: {question}")
     
-    # QnA 에이전트 실행
-    print("\n🤖 QnA 에이전트 실행 중...")
-    qna_result = qnaAgent(question)
-    print(f"\n✅ QnA 결과:\n{qna_result.structured_output}")
+    # 진행 이벤트 스트리밍 (AGENT_STREAM=1: 콘솔 출력, AGENT_TIMELINE_FILE: 호출 구간 타임라인 저장)
+    tracker = None
+    if os.getenv("AGENT_STREAM") == "1" or os.getenv("AGENT_TIMELINE_FILE"):
+        sinks = [ConsoleSink(show_text=True)] if os.getenv("AGENT_STREAM") == "1" else []
+        tracker = ProgressTracker(sinks, timeline_file=os.getenv("AGENT_TIMELINE_FILE")).activate()
+    
+    # 호출 계측 (AGENT_METRICS_FILE: 호출별 JSONL 기록, AGENT_METRICS_PORT: Prometheus 형식 /metrics 제공)
+    recorder = MetricsRecorder(os.getenv("AGENT_METRICS_FILE")).activate()
+    metrics_server = recorder.serve_prometheus(port=int(os.environ["AGENT_METRICS_PORT"])) if os.getenv("AGENT_METRICS_PORT") else None
+    
+    try:
+        # QnA 에이전트 실행
+        print("\n🤖 QnA 에이전트 실행 중...")
+        qna_result = asyncio.run(run_agent("qnaAgent", qnaAgent, question, stage="qna"))
+        print(f"\n✅ QnA 결과:\n{qna_result.structured_output}")
+        
+        # 레터 에이전트 실행
+        print("\n📄 HTML 안내문 생성 중...")
+        letter_result = asyncio.run(run_agent("letterAgent", letterAgent, f"다음 QnA 내용을 HTML 레터로 작성해 주세요: {qna_result.structured_output.model_dump_json()}", stage="letter"))
+        print(f"\n✅ 레터 생성 완료:\n{letter_result}")
+    finally:
+        if tracker:
+            tracker.close()
+        recorder.close()
+        if metrics_server:
+            metrics_server.shutdown()
     
-    # 레터 에이전트 실행
-    print("\n📄 HTML 안내문 생성 중...")
-    letter_result = letterAgent(f"다음 QnA 내용을 HTML 레터로 작성해 주세요: {qna_result.structured_output.model_dump_json()}")
-    print(f"\n✅ 레터 생성 완료:\n{letter_result}")
+    print(f"\n📊 호출 지표:\n{json.dumps(recorder.summary(), ensure_ascii=False, indent=2)}")
     
     print("\n🎉 데모 완료!")
 
@@ -0,0 +1,85 @@
+"""
+에이전트 풀
+
+하나의 Agent 인스턴스는 대화 이력을 공유하므로 동시에 여러 요청을 처리할 수 없습니다.
+AgentPool은 작업마다 독립된 Agent를 새로 만들어, 동시 실행 수를 제한하면서 병렬로 호출하고
+결과를 입력 순서대로 돌려줍니다. (Bedrock 호출량 제한을 고려해 동시 실행 수를 조절)
+"""
+import asyncio
+import json
+import os
+import re
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from strands import Agent
+
+from agent_metrics import run_agent
+
+JSON_BLOCK = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
+
+
+def extract_json(text: str) -> Optional[Any]:
+    """
+    에이전트 응답에서 JSON 결과를 추출 (```json 코드 블록 또는 응답 전체). 없으면 None
+    """
+    candidates = JSON_BLOCK.findall(text) + [text]
+    for candidate in candidates:
+        start = min((i for i in (candidate.find("{"), candidate.find("[")) if i >= 0), default=-1)
+        if start < 0:
+            continue
+        try:
+            value, _ = json.JSONDecoder().raw_decode(candidate[start:])
+            return value
+        except ValueError:
+            continue
+    return None
+
+
+class AgentPool:
+    def __init__(self, name: str, factory: Callable[[], Agent], max_concurrency: Optional[int] = None, stage: str = ""):
+        """
+        Args:
+            name: 오류 메시지 등에 사용할 에이전트 이름
+            factory: 호출할 때마다 새 Agent 인스턴스를 생성하는 함수
+            max_concurrency: 동시에 실행할 최대 에이전트 수 (기본값: 환경변수 AGENT_MAX_CONCURRENCY 또는 4)
+            stage: 계측 기록의 단계 태그 (기본값: name)
+        """
+        self.name = name
+        self.stage = stage or name
+        self.factory = factory
+        self.max_concurrency = max_concurrency or int(os.getenv("AGENT_MAX_CONCURRENCY", "4"))
+
+    async def run_async(self, prompts: List[str], listings: Optional[List[str]] = None) -> List[Dict]:
+        """
+        요청마다 독립된 에이전트로 병렬 실행하고, 결과를 입력 순서대로 반환
+        각 결과는 {"query", "success", "result" 또는 "error", "elapsed_s"} 형태
+        listings: 요청별 매물 식별자 (계측 기록의 listing 태그, 생략 가능, 지정하면 prompts와 길이가 같아야 함)
+        """
+        if listings is None:
+            listings = [""] * len(prompts)
+        elif len(listings) != len(prompts):
+            raise ValueError(f"{self.name}: {len(prompts)} prompts but {len(listings)} listings")
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run_one(index: int, prompt: str, listing: str) -> Dict:
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    agent = self.factory()
+                    response = await run_agent(f"{self.name} #{index + 1}", agent, prompt, stage=self.stage, listing=listing)
+                    result = {"query": prompt, "success": True, "result": str(response)}
+                except Exception as e:
+                    result = {"query": prompt, "success": False, "error": f"Error in {self.name}: {str(e)}"}
+                result["elapsed_s"] = round(time.perf_counter() - started, 2)
+                return result
+
+        return await asyncio.gather(*(
+            run_one(index, prompt, listing) for index, (prompt, listing) in enumerate(zip(prompts, listings))
+        ))
+
+    def run(self, prompts: List[str], listings: Optional[List[str]] = None) -> List[Dict]:
+        """
+        동기 코드에서 호출하기 위한 run_async 래퍼
+        """
+        return asyncio.run(self.run_async(prompts, listings))
@@ -0,0 +1,195 @@
+"""
+단계별 체크포인트
+
+매물별 분석 결과를 입력 내용의 해시로 저장해 두고(content-addressed), 다시 실행할 때 입력이 바뀐 매물만
+새로 분석합니다. 입력이 같으면 날짜가 달라도 이전 결과를 재사용하므로 매일 반복 실행 시 대부분의 모델 호출을 건너뜁니다.
+분석 도중 중단되어도 완료된 매물의 결과는 남아 있어 다음 실행에서 나머지만 이어서 처리합니다.
+
+단계 산출물(output/지역명_yymmdd_N_*.json|csv)은 생성할 때 입력 해시를 manifest에 기록하여
+pipeline_status 도구로 어느 단계까지 유효하게 완료되었는지 확인할 수 있습니다.
+"""
+import glob
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from strands.tools import tool
+
+CHECKPOINT_DIR = os.getenv("PIPELINE_CHECKPOINT_DIR", os.path.join("output", ".checkpoints"))
+
+# 단계 번호 → 산출물 접미사 (output/지역명_yymmdd_{suffix})
+STAGES = {
+    1: "1_listing.json",
+    2: "2_location.json",
+    3: "3_right.json",
+    4: "4_roi.csv",
+    5: "5_report.html",
+}
+# 단계별 입력 산출물 (입력 해시 계산에 사용)
+STAGE_INPUTS = {1: [], 2: [1], 3: [1], 4: [1, 2, 3], 5: [4]}
+
+
+def content_hash(*parts: Any) -> str:
+    """
+    JSON으로 직렬화 가능한 값들의 SHA-256 해시 (키 순서와 공백에 무관)
+    """
+    canonical = json.dumps(parts, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_json(path: str, data: Any) -> None:
+    """
+    중간에 중단되어도 깨진 파일이 남지 않도록 임시 파일에 쓴 뒤 교체
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class StageStore:
+    def __init__(self, stage: str, version: str = "", root: Optional[str] = None):
+        """
+        Args:
+            stage: 단계 이름 (예: location, right)
+            version: 결과에 영향을 주는 설정(시스템 프롬프트, 모델 ID 등)의 해시. 바뀌면 이전 결과를 사용하지 않음
+            root: 저장 디렉터리 (기본값: 환경변수 PIPELINE_CHECKPOINT_DIR 또는 output/.checkpoints)
+        """
+        self.stage = stage
+        self.version = version
+        self.directory = os.path.join(root or CHECKPOINT_DIR, stage)
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, inputs: Any) -> str:
+        return content_hash(self.stage, self.version, inputs)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, inputs: Any) -> Optional[Any]:
+        """
+        같은 입력으로 저장된 결과. 없으면 None
+        """
+        path = self._path(self.key(inputs))
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry["result"]
+
+    def put(self, inputs: Any, result: Any) -> None:
+        _write_json(self._path(self.key(inputs)), {
+            "stage": self.stage,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "inputs": inputs,
+            "result": result,
+        })
+
+
+def _manifest_path() -> str:
+    return os.path.join(CHECKPOINT_DIR, "manifest.json")
+
+
+def _load_manifest() -> Dict[str, Dict]:
+    try:
+        with open(_manifest_path(), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def inputs_hash(paths) -> Optional[str]:
+    """
+    입력 산출물 파일들의 내용 해시. 입력 파일이 하나라도 없으면 None
+    """
+    if not all(os.path.exists(path) for path in paths):
+        return None
+    return content_hash([file_hash(path) for path in paths])
+
+
+def record_artifact(path: str, input_paths) -> None:
+    """
+    단계 산출물을 만든 입력 파일들의 해시와 산출물 자체의 해시를 manifest에 기록
+    """
+    manifest = _load_manifest()
+    manifest[os.path.normpath(path)] = {
+        "inputs": inputs_hash(input_paths),
+        "sha256": file_hash(path),
+        "created": datetime.now().isoformat(timespec="seconds"),
+    }
+    _write_json(_manifest_path(), manifest)
+
+
+def artifact_status(path: str, input_paths) -> str:
+    """
+    산출물 상태
+    - missing: 파일 없음
+    - stale: 입력이 바뀌었거나 기록 이후 산출물이 수정됨
+    - complete: 현재 입력으로 만들어진 산출물
+    - unverified: 파일은 있으나 manifest 기록이 없음 (수집 단계나 에이전트가 직접 저장한 파일)
+    """
+    if not os.path.exists(path):
+        return "missing"
+    entry = _load_manifest().get(os.path.normpath(path))
+    if entry is None:
+        return "unverified"
+    if entry["sha256"] != file_hash(path) or entry["inputs"] != inputs_hash(input_paths):
+        return "stale"
+    return "complete"
+
+
+@tool
+def pipeline_status(prefix: str) -> str:
+    """
+    파이프라인 단계 산출물의 완료 여부를 확인합니다. 중단된 실행을 이어서 하거나 재실행할 단계를 정할 때 사용하세요.
+    complete/unverified 단계는 다시 실행하지 않아도 되며, next_stage부터 실행하면 됩니다.
+
+    Args:
+        prefix: 산출물 경로 접두사 (예: output/강남권_251202). 생략된 날짜 대신 가장 최근 날짜를 쓰려면 output/강남권
+    """
+    try:
+        if not any(os.path.exists(f"{prefix}_{suffix}") for suffix in STAGES.values()):
+            # 날짜 없이 지역명만 주어진 경우 가장 최근 산출물 접두사를 사용
+            candidates = sorted(glob.glob(f"{prefix}_*_{STAGES[1]}"))
+            if candidates:
+                prefix = candidates[-1][: -len(STAGES[1]) - 1]
+
+        stages = {}
+        for number, suffix in STAGES.items():
+            path = f"{prefix}_{suffix}"
+            input_paths = [f"{prefix}_{STAGES[i]}" for i in STAGE_INPUTS[number]]
+            status = artifact_status(path, input_paths)
+            if status != "missing" and any(
+                stages[i]["status"] in ("missing", "stale") for i in STAGE_INPUTS[number]
+            ):
+                # 입력 단계를 다시 실행해야 하면 이 단계 산출물도 다시 만들어야 함
+                status = "stale"
+            stages[number] = {"artifact": path, "status": status}
+
+        next_stage = next(
+            (number for number, stage in stages.items() if stage["status"] in ("missing", "stale")), None
+        )
+
+        return json.dumps({"prefix": prefix, "stages": stages, "next_stage": next_stage}, ensure_ascii=False)
+    except Exception as e:
+        return f"Error in pipeline status: {str(e)}"
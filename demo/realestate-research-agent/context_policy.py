@@ -0,0 +1,155 @@
+"""
+전문 에이전트 호출별 컨텍스트 정책
+
+오케스트레이터가 같은 전문 에이전트를 반복 호출하면 이전 매물의 도구 호출 기록까지 계속 누적되어
+호출마다 입력 토큰과 지연 시간이 늘어납니다. ContextPolicy는 호출 직전에 대화 이력을 정리합니다.
+- fresh: 매 호출마다 빈 이력으로 시작 (기본값)
+- window: 최근 window_size개 메시지만 유지 (도구 호출/결과 쌍이 끊기지 않도록 사용자 요청 경계에서 자름)
+- summary: 추정 토큰 수가 token_budget을 넘으면 오래된 이력을 요약으로 대체
+- keep: 이력을 그대로 유지 (기존 동작)
+호출마다 이력 크기와 토큰 사용량을 기록하여 stats()와 JSONL 파일로 확인할 수 있습니다.
+"""
+import asyncio
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from strands import Agent
+
+from agent_metrics import run_agent
+
+MODES = ("fresh", "window", "summary", "keep")
+
+
+def estimate_tokens(messages: List[Dict]) -> int:
+    """
+    대화 이력의 대략적인 토큰 수 (직렬화한 문자 수 / 3, 한글과 영문이 섞인 경우의 보수적 추정)
+    """
+    return len(json.dumps(messages, ensure_ascii=False, default=str)) // 3
+
+
+def _is_user_prompt(message: Dict) -> bool:
+    return message.get("role") == "user" and not any(
+        "toolResult" in content for content in message.get("content", [])
+    )
+
+
+def trim_to_window(messages: List[Dict], window_size: int) -> None:
+    """
+    최근 window_size개 메시지만 남기되, 잘린 지점이 도구 결과 중간이면 다음 사용자 요청부터 유지
+    """
+    if len(messages) <= window_size:
+        return
+    cut = len(messages) - window_size
+    while cut < len(messages) and not _is_user_prompt(messages[cut]):
+        cut += 1
+    del messages[:cut]
+
+
+class ContextPolicy:
+    def __init__(
+        self,
+        mode: Optional[str] = None,
+        window_size: Optional[int] = None,
+        token_budget: Optional[int] = None,
+        metrics_file: Optional[str] = None,
+    ):
+        """
+        Args:
+            mode: fresh/window/summary/keep (기본값: 환경변수 AGENT_CONTEXT_POLICY 또는 fresh)
+            window_size: window 모드에서 유지할 메시지 수 (기본값: AGENT_CONTEXT_WINDOW 또는 10)
+            token_budget: summary 모드의 이력 토큰 한도 (기본값: AGENT_CONTEXT_TOKEN_BUDGET 또는 20000)
+            metrics_file: 호출별 지표를 추가할 JSONL 파일 경로 (기본값: AGENT_CONTEXT_METRICS_FILE, 없으면 기록 안 함)
+        """
+        self.mode = mode or os.getenv("AGENT_CONTEXT_POLICY", "fresh")
+        if self.mode not in MODES:
+            raise ValueError(f"Unknown context policy: {self.mode} (expected one of {MODES})")
+        self.window_size = window_size or int(os.getenv("AGENT_CONTEXT_WINDOW", "10"))
+        self.token_budget = token_budget or int(os.getenv("AGENT_CONTEXT_TOKEN_BUDGET", "20000"))
+        self.metrics_file = metrics_file or os.getenv("AGENT_CONTEXT_METRICS_FILE")
+        self.records: List[Dict] = []
+        self._lock = threading.Lock()
+        self._summarizer = None
+
+    async def apply(self, agent: Agent) -> None:
+        """
+        호출 직전에 에이전트의 대화 이력을 정책에 맞게 정리
+        """
+        if self.mode == "fresh":
+            agent.messages.clear()
+        elif self.mode == "window":
+            trim_to_window(agent.messages, self.window_size)
+        elif self.mode == "summary":
+            await self._summarize(agent)
+
+    async def _summarize(self, agent: Agent) -> None:
+        if estimate_tokens(agent.messages) <= self.token_budget:
+            return
+        if self._summarizer is None:
+            from strands.agent.conversation_manager import SummarizingConversationManager
+            self._summarizer = SummarizingConversationManager(
+                summary_ratio=0.5, preserve_recent_messages=2
+            )
+        # 요약 후에도 한도를 넘으면 몇 차례 더 요약하고, 그래도 넘으면 창 크기로 자름
+        # (요약은 동기 모델 호출이므로 다른 에이전트가 멈추지 않도록 별도 스레드에서 실행)
+        for _ in range(3):
+            try:
+                await asyncio.to_thread(self._summarizer.reduce_context, agent)
+            except Exception:
+                break
+            if estimate_tokens(agent.messages) <= self.token_budget:
+                return
+        trim_to_window(agent.messages, self.window_size)
+
+    async def invoke(self, name: str, agent: Agent, query: str):
+        """
+        정책을 적용한 뒤 에이전트를 호출하고, 호출 전 이력 크기와 토큰 사용량을 기록
+        (진행 이벤트 스트리밍이 켜져 있으면 스트리밍으로 호출)
+        """
+        messages_before = len(agent.messages)
+        await self.apply(agent)
+        record = {
+            "ts": datetime.now().isoformat(timespec="seconds"),
+            "agent": name,
+            "policy": self.mode,
+            "messages_before": messages_before,
+            "messages_sent": len(agent.messages),
+            "history_tokens_est": estimate_tokens(agent.messages),
+        }
+
+        started = time.perf_counter()
+        response = None
+        try:
+            response = await run_agent(name, agent, query, stage=name)
+        finally:
+            usage = getattr(getattr(response, "metrics", None), "accumulated_usage", None) or {}
+            record["latency_s"] = round(time.perf_counter() - started, 2)
+            record["input_tokens"] = usage.get("inputTokens")
+            record["output_tokens"] = usage.get("outputTokens")
+            self._record(record)
+        return response
+
+    def _record(self, record: Dict) -> None:
+        with self._lock:
+            self.records.append(record)
+            if self.metrics_file:
+                with open(self.metrics_file, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def stats(self) -> Dict[str, Dict]:
+        """
+        에이전트별 호출 수, 최대 이력 메시지 수, 누적 이력 토큰(추정)과 입력 토큰
+        """
+        summary = {}
+        for record in self.records:
+            entry = summary.setdefault(record["agent"], {
+                "calls": 0, "max_messages_sent": 0, "history_tokens_est": 0, "input_tokens": 0,
+            })
+            entry["calls"] += 1
+            entry["max_messages_sent"] = max(entry["max_messages_sent"], record["messages_sent"])
+            entry["history_tokens_est"] += record["history_tokens_est"]
+            entry["input_tokens"] += record.get("input_tokens") or 0
+        return summary
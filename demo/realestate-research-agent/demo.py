@@ -1,12 +1,29 @@
 import os
+import sys
+import json
+import argparse
+import asyncio
+from datetime import datetime
+from typing import List, Optional
 from dotenv import load_dotenv
 from strands.tools.mcp import MCPClient
 from mcp import stdio_client, StdioServerParameters
-from botocore.config import Config
-from strands.models import BedrockModel
+from mcp.client.streamable_http import streamablehttp_client
 from strands import Agent
 from strands.tools import tool
 from strands_tools import current_time, file_write, file_read, calculator, http_request
+# 데모 공통 모듈 (진행 이벤트/타임라인, 호출 계측)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+from agent_progress import ConsoleSink, ProgressTracker
+from agent_metrics import MetricsRecorder, run_agent
+from roi_engine import roi_batch
+from report_renderer import load_roi_rows, render_report, render_report_file
+from rights_parser import parse_encumbrances
+from agent_pool import AgentPool, extract_json
+from context_policy import ContextPolicy
+from pipeline import Node, Pipeline
+from checkpoint import StageStore, content_hash, pipeline_status, record_artifact
+from model_config import create_model, model_id, routing
 
 # 환경변수 설정
 os.environ["BYPASS_TOOL_CONSENT"] = "true"
@@ -77,6 +94,7 @@ json
 3. 생활 편의시설: 매물 반경에 위치한 생활편의시설을 파악하세요. 
    - 반경 500m 내 대형마트, 편의점
    - 반경 1km 내 병원, 학교
+   - 교통/생활 편의시설은 `amenitySweep` 도구로 매물당 한 번에 조사하세요. (area에 매물의 동 이름을 지정)
 4. 폴백 루틴: 네이버 지도와 협업할 수 없는 경우
    - 더 이상 시도하지 입지 분석 단계를 건너띄세요.
 
@@ -102,6 +120,10 @@ json
 매물의 권리관계를 분석하고 인수/소멸 여부를 판단합니다.
 
 ## 업무 원칙 (Principles)
+먼저 `parse_encumbrances` 도구로 매물 목록 파일의 권리관계 문자열을 한 번에 구조화하세요.
+권리 종류, 금액(원), 채권자, 부존재 여부는 도구 결과를 그대로 사용하고, 직접 다시 해석하지 마세요.
+선순위/후순위 판단과 needs_review가 true인 항목만 아래 기준으로 판단하세요.
+
 분석 기준:
 1. 근저당권:
    - 설정일자가 경매 기일보다 선순위면 인수
@@ -135,6 +157,9 @@ ROI_계산_프롬프트 = '''
 매물의 예상 ROI를 계산하고 투자 가치를 평가합니다.
 
 ## 업무 원칙 (Principles)
+`roi_batch` 도구에 매물/입지 분석/권리 분석 파일 경로를 전달하여 모든 매물의 ROI를 한 번에 계산하고 CSV로 저장하세요.
+도구 결과를 그대로 사용하고, 매물별로 다시 계산하지 마세요. 도구를 사용할 수 없을 때만 아래 공식을 직접 계산하세요.
+
 입력:
 - 최저가 (minimum_bid)
 - 주변 시세 (market_price_nearby)
@@ -185,13 +210,16 @@ json
 
 ## 업무 원칙 (Principles)
 당신의 팀원 에이전트에게 적합하게 관심사를 분리하고 업무를 위임합니다.
+0. `pipeline_status`로 오늘 산출물(`output/지역명_yymmdd`) 상태를 확인하고, complete/unverified 단계는 다시 실행하지 않고 next_stage부터 진행
 1. 매물 수집 에이전트 → 강남구 경매 매물 리스트 수집
 2. 각 매물에 대해 병렬 실행:
-   - 위치 분석 에이전트
-   - 권리관계 분석 에이전트
+   - 위치 분석 에이전트 → `location_batch`에 listing_file(`..._1_listing.json`)을 전달
+   - 권리관계 분석 에이전트 → `right_batch`에 listing_file(`..._1_listing.json`)을 전달
+   - 두 도구의 output_file에 각 단계 산출물 경로(`..._2_location.json`, `..._3_right.json`)를 지정
+   - 입력이 바뀌지 않은 매물은 저장된 결과를 재사용하므로 전체 매물을 그대로 전달
 3. ROI 계산 에이전트 → 수익률 계산
 4. 종합 평가 에이전트 → 최종 등급 부여
-5. 결과를 ROI 순으로 정렬하여 상위 5개 매물 리포트 생성
+5. `render_report`로 ROI 순 상위 5개 매물 리포트 생성 (HTML을 직접 작성하지 말고 매물별 한두 문장 코멘트만 narratives로 전달)
 
 ## 출력물 (Artifact)
 `output/지역명_yymmdd_5_report.html`
@@ -202,107 +230,329 @@ PLAYWRIGHT_MCP = MCPClient(lambda: stdio_client(
     StdioServerParameters(command="npx", args=["@playwright/mcp@latest"])
 ))
 
-NAVER_MAP_MCP = MCPClient(lambda: stdio_client(
-    StdioServerParameters(
-        command="uv", 
-        args=["run", "--directory", os.path.join(os.getcwd(), "naver-map-mcp/src"), os.path.join(os.getcwd(), "naver-map-mcp/src/naver_map_mcp")], 
-        env={
-            "NAVER_MAPS_CLIENT_ID" : os.environ["NAVER_MAPS_CLIENT_ID"],
-            "NAVER_MAPS_CLIENT_SECRET" : os.environ["NAVER_MAPS_CLIENT_SECRET"],
-            "NAVER_CLIENT_API" : os.environ["NAVER_CLIENT_API"],
-            "NAVER_CLIENT_SECRET" : os.environ["NAVER_CLIENT_SECRET"]}
-    )
-))
-
-# 모델 설정
-model = BedrockModel(
-    model_id="global.anthropic.claude-opus-4-5-20251101-v1:0",
-    region_name="ap-northeast-2",
-    boto_client_config=Config(read_timeout=1000)
-)
+# NAVER_MAP_MCP_URL이 설정되어 있으면 이미 실행 중인 공유 서버(Streamable HTTP)에 접속하고,
+# 없으면 기존처럼 stdio 하위 프로세스로 서버를 실행
+NAVER_MAP_MCP_URL = os.getenv("NAVER_MAP_MCP_URL")
+
+if NAVER_MAP_MCP_URL:
+    NAVER_MAP_MCP = MCPClient(lambda: streamablehttp_client(NAVER_MAP_MCP_URL))
+else:
+    NAVER_MAP_MCP = MCPClient(lambda: stdio_client(
+        StdioServerParameters(
+            command="uv", 
+            args=["run", "--directory", os.path.join(os.getcwd(), "naver-map-mcp/src"), os.path.join(os.getcwd(), "naver-map-mcp/src/naver_map_mcp")], 
+            env={
+                "NAVER_MAPS_CLIENT_ID" : os.environ["NAVER_MAPS_CLIENT_ID"],
+                "NAVER_MAPS_CLIENT_SECRET" : os.environ["NAVER_MAPS_CLIENT_SECRET"],
+                "NAVER_CLIENT_API" : os.environ["NAVER_CLIENT_API"],
+                "NAVER_CLIENT_SECRET" : os.environ["NAVER_CLIENT_SECRET"]}
+        )
+    ))
+
+# 모델 설정: 단계별 모델 등급과 프롬프트 캐시는 model_config.py (AGENT_MODEL_*)
 
 # 전문 에이전트 정의
 listing_agent = Agent(
-    model=model,
+    model=create_model("listing"),
     system_prompt=매물_수집_프롬프트,
     tools=[current_time, PLAYWRIGHT_MCP, file_write]
 )
 
-location_agent = Agent(
-    model=model,
-    system_prompt=입지_분석_프롬프트,
-    tools=[current_time, NAVER_MAP_MCP, http_request, file_read, file_write]
-)
+def create_location_agent():
+    return Agent(
+        model=create_model("location"),
+        system_prompt=입지_분석_프롬프트,
+        tools=[current_time, NAVER_MAP_MCP, http_request, file_read, file_write]
+    )
 
-right_agent = Agent(
-    model=model,
-    system_prompt=권리_분석_프롬프트,
-    tools=[current_time, file_read, file_write, calculator]
-)
+def create_right_agent():
+    return Agent(
+        model=create_model("right"),
+        system_prompt=권리_분석_프롬프트,
+        tools=[parse_encumbrances, current_time, file_read, file_write, calculator]
+    )
+
+location_agent = create_location_agent()
+right_agent = create_right_agent()
 
 roi_agent = Agent(
-    model=model,
+    model=create_model("roi"),
     system_prompt=ROI_계산_프롬프트,
-    tools=[file_read, file_write, calculator]
+    tools=[roi_batch, file_read, file_write, calculator]
 )
 
+# 전문 에이전트는 오케스트레이터가 반복 호출하므로 호출마다 대화 이력을 정리
+# (AGENT_CONTEXT_POLICY: fresh/window/summary/keep, 호출별 이력 크기는 context_policy.stats())
+context_policy = ContextPolicy()
+
 # 에이전트 도구 래퍼
 @tool
-def listing(query: str):
+async def listing(query: str):
     """
     경매매물 수집 에이전트를 호출합니다.
     옥션원(auction1.co.kr) 사이트에서 특정 지역의 부동산 경매 매물을 조회할 수 있습니다.
     """
     try:
-        response = listing_agent(query)
+        response = await context_policy.invoke("listing", listing_agent, query)
         return str(response)
     except Exception as e:
         return f"Error in research assistant: {str(e)}"
 
 @tool
-def location(query: str):
+async def location(query: str):
     """
     위치 분석 에이전트를 호출합니다.
     매물의 위치적 가치를 평가합니다.
     """
     try:
-        response = location_agent(query)
+        response = await context_policy.invoke("location", location_agent, query)
         return str(response)
     except Exception as e:
         return f"Error in location assistant: {str(e)}"
 
 @tool
-def right(query: str):
+async def right(query: str):
     """
     권리 분석 에이전트를 호출합니다.
     매물의 권리관계를 분석하고 인수/소멸 여부를 판단합니다.
     """
     try:
-        response = right_agent(query)
+        response = await context_policy.invoke("right", right_agent, query)
         return str(response)
     except Exception as e:
         return f"Error in rights assistant: {str(e)}"
 
 @tool
-def roi(query: str):
+async def roi(query: str):
     """
     ROI 계산 에이전트를 호출합니다.
     매물의 예상 ROI를 계산하고 투자 가치를 평가합니다.
     """
     try:
-        response = roi_agent(query)
+        response = await context_policy.invoke("roi", roi_agent, query)
         return str(response)
     except Exception as e:
         return f"Error in ROI assistant: {str(e)}"
 
+# 매물별 병렬 실행 (매물마다 독립된 에이전트 인스턴스 사용, 동시 실행 수는 AGENT_MAX_CONCURRENCY)
+location_pool = AgentPool("location assistant", create_location_agent, stage="location")
+right_pool = AgentPool("rights assistant", create_right_agent, stage="right")
+
+병렬_작업_지시 = "\n\n이 요청은 매물 1건에 대한 병렬 작업입니다. 파일을 저장하지 말고 분석 결과 JSON만 응답하세요."
+
+# 매물별 결과 체크포인트 (입력이 같은 매물은 이전 결과를 재사용, 프롬프트나 모델이 바뀌면 무효화)
+location_store = StageStore("location", content_hash(입지_분석_프롬프트, 병렬_작업_지시, model_id("location")))
+right_store = StageStore("right", content_hash(권리_분석_프롬프트, 병렬_작업_지시, model_id("right")))
+
+# 단계별로 결과에 영향을 주는 매물 필드 (이 필드가 바뀐 매물만 다시 분석)
+입지_입력_필드 = ["case_number", "address"]
+권리_입력_필드 = ["case_number", "address", "appraisal_value", "minimum_bid", "encumbrances"]
+
+def listing_queries(listing_file: str, fields: List[str], 요청: str):
+    with open(listing_file, encoding="utf-8") as f:
+        listings = json.load(f)
+    if isinstance(listings, dict):
+        listings = listings.get("properties", [])
+
+    inputs = [{field: listing.get(field) for field in fields} for listing in listings]
+    queries = [f"{요청}\n{json.dumps(item, ensure_ascii=False)}" for item in inputs]
+    return queries, inputs
+
+async def run_pool(pool: AgentPool, store: StageStore, queries: List[str], inputs: List, output_file: str, input_files: List[str]) -> str:
+    # 저장된 결과가 있는 매물은 건너뛰고 나머지만 실행
+    results = [store.get(item) for item in inputs]
+    pending = [i for i, result in enumerate(results) if result is None]
+    listings = [inputs[i].get("case_number", "") if isinstance(inputs[i], dict) else "" for i in pending]
+    computed = await pool.run_async([queries[i] + 병렬_작업_지시 for i in pending], listings)
+    for i, result in zip(pending, computed):
+        result["query"] = queries[i]
+        # JSON 결과를 얻은 매물만 저장 (실패한 매물은 다음 실행에서 다시 시도)
+        if result["success"] and extract_json(result["result"]) is not None:
+            store.put(inputs[i], result)
+        results[i] = result
+    for i, result in enumerate(results):
+        result["cached"] = i not in pending
+
+    # 매물별 결과 JSON을 모아 단계 산출물로 저장
+    if output_file:
+        properties = []
+        for result in results:
+            value = extract_json(result.get("result", ""))
+            if isinstance(value, dict):
+                properties.extend(value.get("properties", [value]))
+            elif isinstance(value, list):
+                properties.extend(value)
+        with open(output_file, "w", encoding="utf-8") as f:
+            json.dump({"properties": properties}, f, ensure_ascii=False, indent=2)
+        if input_files and all(result["success"] for result in results):
+            record_artifact(output_file, input_files)
+
+    return json.dumps(results, ensure_ascii=False)
+
+@tool
+async def location_batch(queries: Optional[List[str]] = None, output_file: str = "", listing_file: str = ""):
+    """
+    위치 분석 에이전트를 매물마다 독립적으로 생성하여 병렬로 호출합니다.
+    결과는 요청 순서대로 반환됩니다. 이전에 같은 입력으로 분석한 매물은 저장된 결과를 재사용합니다 (cached: true).
+
+    Args:
+        queries: 매물별 위치 분석 요청 목록 (매물 1건당 요청 1개, 사건번호와 주소 포함). listing_file을 주면 생략
+        output_file: 매물별 결과를 {"properties": [...]} 형태로 모아 저장할 JSON 파일 경로 (생략 가능)
+        listing_file: 매물 목록 JSON 파일 경로. 지정하면 매물마다 요청을 만들고 주소가 바뀐 매물만 다시 분석
+    """
+    if listing_file:
+        queries, inputs = listing_queries(listing_file, 입지_입력_필드, "다음 매물의 입지를 분석하세요.")
+    else:
+        queries = queries or []
+        inputs = list(queries)
+    return await run_pool(location_pool, location_store, queries, inputs, output_file, [listing_file] if listing_file else [])
+
+@tool
+async def right_batch(queries: Optional[List[str]] = None, output_file: str = "", listing_file: str = ""):
+    """
+    권리 분석 에이전트를 매물마다 독립적으로 생성하여 병렬로 호출합니다.
+    결과는 요청 순서대로 반환됩니다. 이전에 같은 입력으로 분석한 매물은 저장된 결과를 재사용합니다 (cached: true).
+
+    Args:
+        queries: 매물별 권리 분석 요청 목록 (매물 1건당 요청 1개, 사건번호와 권리관계 포함). listing_file을 주면 생략
+        output_file: 매물별 결과를 {"properties": [...]} 형태로 모아 저장할 JSON 파일 경로 (생략 가능)
+        listing_file: 매물 목록 JSON 파일 경로. 지정하면 매물마다 요청을 만들고 권리관계/가격이 바뀐 매물만 다시 분석
+    """
+    if listing_file:
+        queries, inputs = listing_queries(listing_file, 권리_입력_필드, "다음 매물의 권리관계를 분석하세요.")
+    else:
+        queries = queries or []
+        inputs = list(queries)
+    return await run_pool(right_pool, right_store, queries, inputs, output_file, [listing_file] if listing_file else [])
+
 # 오케스트레이터 에이전트
 realestate_research_agency = Agent(
-    model=model,
+    model=create_model("orchestrator"),
     system_prompt=오케스트레이터_프롬프트,
-    tools=[listing, location, right, roi, current_time, file_read, file_write]
+    tools=[pipeline_status, listing, location_batch, right_batch, location, right, roi, render_report, current_time, file_read, file_write]
 )
 
+# 코드 기반 파이프라인 (오케스트레이터 LLM 없이 매물 수집 → 입지 ∥ 권리 → ROI → 리포트를 직접 실행)
+리포트_작성_프롬프트 = '''
+# 5단계: 리포트 코멘트 작성 에이전트
+당신은 경매 매물 투자 리포트 작성자입니다. 리포트 HTML은 템플릿으로 생성되므로 코멘트만 작성합니다.
+ROI 상위 매물의 계산 결과와 입지/권리 요약을 보고, 매물별 투자 의견을 한두 문장으로 작성하세요.
+
+## 출력 형태 (Output)
+json
+{
+  "summary": "전체 매물에 대한 한두 문장 요약",
+  "2024타경12345": "매물별 한두 문장 투자 의견"
+}
+'''
+
+def create_report_agent():
+    return Agent(
+        model=create_model("report"),
+        system_prompt=리포트_작성_프롬프트,
+        tools=[]
+    )
+
+def create_pipeline(request: str, prefix: str, tracker=None) -> Pipeline:
+    """
+    경매 분석 파이프라인 DAG 생성
+    prefix: 단계 산출물 경로 접두사 (예: output/강남권_251202)
+    """
+    listing_file = f"{prefix}_1_listing.json"
+    location_file = f"{prefix}_2_location.json"
+    right_file = f"{prefix}_3_right.json"
+    roi_file = f"{prefix}_4_roi.csv"
+    report_file = f"{prefix}_5_report.html"
+
+    async def collect_listings(inputs):
+        # 오늘 수집한 매물 목록이 있으면 재사용 (중단된 실행 재개)
+        if not os.path.exists(listing_file):
+            query = f"{request}\n수집한 매물 목록을 `{listing_file}`에 저장하세요."
+            await context_policy.invoke("listing", listing_agent, query)
+        if not os.path.exists(listing_file):
+            raise RuntimeError(f"Listing agent did not write {listing_file}")
+        return listing_file
+
+    async def analyze_locations(inputs):
+        results = json.loads(await location_batch(listing_file=inputs["listing"], output_file=location_file))
+        return {"file": location_file, "cached": sum(result["cached"] for result in results), "count": len(results)}
+
+    async def analyze_rights(inputs):
+        results = json.loads(await right_batch(listing_file=inputs["listing"], output_file=right_file))
+        return {"file": right_file, "cached": sum(result["cached"] for result in results), "count": len(results)}
+
+    async def calculate_roi(inputs):
+        result = roi_batch(inputs["listing"], inputs["location"]["file"], inputs["right"]["file"], roi_file)
+        if result.startswith("Error"):
+            raise RuntimeError(result)
+        return roi_file
+
+    async def write_report(inputs, top_n=5):
+        # 모델은 상위 매물의 짧은 코멘트만 작성하고, 리포트는 템플릿으로 렌더링
+        top = load_roi_rows(inputs["roi"])[:top_n]
+        try:
+            response = await run_agent("report", create_report_agent(), json.dumps(top, ensure_ascii=False), stage="report")
+            narratives = extract_json(str(response))
+        except Exception:
+            narratives = None
+        return render_report_file(
+            inputs["roi"], report_file, listing_file, location_file, right_file, top_n,
+            narratives if isinstance(narratives, dict) else None,
+        )
+
+    return Pipeline([
+        Node("listing", collect_listings),
+        Node("location", analyze_locations, ("listing",)),
+        Node("right", analyze_rights, ("listing",)),
+        Node("roi", calculate_roi, ("listing", "location", "right")),
+        Node("report", write_report, ("roi",)),
+    ], tracker)
+
 # 메인 실행
+async def main(args):
+    tracker = None
+    if args.stream or args.timeline or args.sse_port:
+        sinks = [ConsoleSink(show_text=args.show_text)] if args.stream else []
+        tracker = ProgressTracker(sinks, timeline_file=args.timeline).activate()
+    server = await tracker.serve_sse(port=args.sse_port) if args.sse_port else None
+    recorder = MetricsRecorder(args.metrics_file).activate()
+    metrics_server = recorder.serve_prometheus(port=args.metrics_port) if args.metrics_port else None
+
+    print(json.dumps({"models": routing()}, ensure_ascii=False, indent=2))
+    started = datetime.now()
+    try:
+        if args.mode == "dag":
+            pipeline = create_pipeline(args.request, f"output/{args.region}_{started:%y%m%d}", tracker)
+            results = await pipeline.run_async()
+            for name, result in results.items():
+                print(f"{name}: {result}")
+            print(json.dumps(pipeline.timings, ensure_ascii=False, indent=2))
+        else:
+            response = await run_agent("orchestrator", realestate_research_agency, args.request, stage="orchestrator")
+            print(response)
+    finally:
+        if tracker:
+            tracker.close()
+        if server:
+            server.should_exit = True
+        recorder.close()
+        if metrics_server:
+            metrics_server.shutdown()
+    print(f"elapsed: {(datetime.now() - started).total_seconds():.1f}s")
+    print(json.dumps(recorder.summary(), ensure_ascii=False, indent=2))
+    print(json.dumps(context_policy.stats(), ensure_ascii=False, indent=2))
+
 if __name__ == "__main__":
-    response = realestate_research_agency("서울 강남권 베스트 아파트 매물을 나열해보세요!")
-    print(response)
+    parser = argparse.ArgumentParser(description="경매 매물 종합평가")
+    parser.add_argument("--mode", choices=["agent", "dag"], default=os.getenv("PIPELINE_MODE", "agent"),
+                        help="agent: LLM 오케스트레이터, dag: 코드 기반 파이프라인")
+    parser.add_argument("--request", default="서울 강남권 베스트 아파트 매물을 나열해보세요!")
+    parser.add_argument("--region", default="강남권", help="dag 모드 산출물 파일명의 지역명")
+    parser.add_argument("--stream", action="store_true", help="에이전트/모델/도구 진행 이벤트를 콘솔에 출력")
+    parser.add_argument("--show-text", action="store_true", help="--stream에서 모델 응답 텍스트도 출력")
+    parser.add_argument("--timeline", help="에이전트/모델/도구 호출 구간을 저장할 JSON 파일 (예: output/timeline.json)")
+    parser.add_argument("--sse-port", type=int, help="진행 이벤트를 http://127.0.0.1:PORT/events 로 SSE 전송")
+    parser.add_argument("--metrics-file", default=os.getenv("AGENT_METRICS_FILE"),
+                        help="에이전트 호출별 토큰/지연 시간/오류 기록을 추가할 JSONL 파일")
+    parser.add_argument("--metrics-port", type=int, help="실행 중 누적 지표를 http://127.0.0.1:PORT/metrics 로 제공 (Prometheus 형식)")
+    asyncio.run(main(parser.parse_args()))
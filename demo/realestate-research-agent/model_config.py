@@ -0,0 +1,87 @@
+"""
+에이전트별 모델 설정
+
+단계(stage)마다 모델 등급(tier)을 지정해, 판단이 필요한 오케스트레이터/입지 분석/권리 분석/리포트 코멘트는 큰 모델을,
+정해진 절차를 따르는 매물 수집과 ROI 계산(계산은 roi_batch가 담당)은 작고 빠른 모델을 사용합니다.
+권리 분석은 parse_encumbrances가 권리관계 문자열을 구조화할 뿐 말소기준권리, 선순위 여부, 인수 여부는 에이전트가 판단하므로 큰 모델을 사용합니다.
+모든 모델은 시스템 프롬프트와 도구 정의 뒤에 캐시 지점(cache point)을 두어, 같은 에이전트를 반복 호출할 때
+긴 프롬프트를 다시 처리하지 않고 캐시에서 읽습니다 (캐시 적중은 호출 계측의 cache_read_tokens로 확인).
+
+환경변수:
+    AGENT_MODEL_LARGE / AGENT_MODEL_SMALL: 등급별 모델 ID
+    AGENT_MODEL_<STAGE>: 단계별 등급(large/small) 또는 모델 ID (예: AGENT_MODEL_LOCATION=small)
+    AGENT_MODEL_PROVIDER: bedrock (기본값) 또는 stub (Bedrock 없이 캐시 적중을 보고하는 로컬 모델, stub_model.py)
+    AGENT_PROMPT_CACHE: false로 설정하면 캐시 지점을 두지 않음
+    BEDROCK_REGION: Bedrock 리전 (기본값: ap-northeast-2)
+"""
+import os
+from functools import lru_cache
+from typing import Dict, Tuple
+
+MODEL_TIERS: Dict[str, Dict] = {
+    "large": {"model_id": "global.anthropic.claude-opus-4-5-20251101-v1:0", "read_timeout": 1000},
+    "small": {"model_id": "global.anthropic.claude-haiku-4-5-20251001-v1:0", "read_timeout": 300},
+}
+
+STAGE_TIERS: Dict[str, str] = {
+    "orchestrator": "large",
+    "location": "large",
+    "report": "large",
+    "right": "large",
+    "listing": "small",
+    "roi": "small",
+}
+
+
+def resolve(stage: str) -> Tuple[str, int]:
+    """
+    단계의 (모델 ID, 읽기 타임아웃 초)
+    """
+    tier = STAGE_TIERS.get(stage, "large")
+    override = os.getenv(f"AGENT_MODEL_{stage.upper()}", "")
+    if override in MODEL_TIERS:
+        tier, override = override, ""
+    default = MODEL_TIERS[tier]
+    model_id = override or os.getenv(f"AGENT_MODEL_{tier.upper()}", default["model_id"])
+    return model_id, default["read_timeout"]
+
+
+def model_id(stage: str) -> str:
+    return resolve(stage)[0]
+
+
+def routing() -> Dict[str, str]:
+    """
+    단계별 모델 ID (실행 시작 시 설정 확인용)
+    """
+    return {stage: model_id(stage) for stage in STAGE_TIERS}
+
+
+@lru_cache(maxsize=None)
+def _build(provider: str, model_id: str, read_timeout: int, cache: bool):
+    cache_config = {"cache_prompt": "default", "cache_tools": "default"} if cache else {}
+    if provider == "stub":
+        from stub_model import StubModel
+        return StubModel(model_id=model_id, **cache_config)
+
+    from botocore.config import Config
+    from strands.models import BedrockModel
+    return BedrockModel(
+        model_id=model_id,
+        region_name=os.getenv("BEDROCK_REGION", "ap-northeast-2"),
+        boto_client_config=Config(read_timeout=read_timeout),
+        **cache_config
+    )
+
+
+def create_model(stage: str):
+    """
+    단계에 맞는 모델 생성 (같은 설정의 단계끼리는 모델 인스턴스를 공유)
+    """
+    model_id, read_timeout = resolve(stage)
+    return _build(
+        os.getenv("AGENT_MODEL_PROVIDER", "bedrock"),
+        model_id,
+        read_timeout,
+        os.getenv("AGENT_PROMPT_CACHE", "true").lower() != "false",
+    )
@@ -0,0 +1,235 @@
+"""
+naver_map_mcp 처리량 벤치마크
+
+대체 서버(stub_server.py)를 띄운 뒤 MCP 도구(geocode, localSearch, localSearchByCoordinate)를
+동시성 수준별로 호출하여 다음 지표를 측정
+- p50/p95/p99 지연 시간
+- 초당 처리 도구 호출 수 (requests/sec)
+- 도구 호출당 업스트림(대체 서버) 호출 수
+
+기본적으로 지오코딩 캐시와 POI 인덱스를 끈 상태에서 업스트림 경로를 측정하며,
+--with-cache 옵션으로 캐시를 켠 상태도 측정 가능 (임시 디렉터리 사용)
+
+Usage:
+  python bench/benchmark.py --concurrency 1 4 16 --requests 64
+  python bench/benchmark.py --throttle-rate 0.05 --json bench_result.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+import numpy as np
+
+from typing import Dict, List
+
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(BENCH_DIR)
+LISTINGS_FILE = os.path.join(PROJECT_DIR, "..", "asset", "강남구_아파트_251127.json")
+TOOLS = ["geocode", "localSearch", "localSearchByCoordinate"]
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+  parser = argparse.ArgumentParser(description="naver_map_mcp throughput benchmark")
+  parser.add_argument("--tools", nargs="+", choices=TOOLS, default=TOOLS)
+  parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 4, 16])
+  parser.add_argument("--requests", type=int, default=64, help="Tool calls per tool/concurrency")
+  parser.add_argument("--latency-ms", type=float, default=50.0)
+  parser.add_argument("--jitter-ms", type=float, default=20.0)
+  parser.add_argument("--throttle-rate", type=float, default=0.0)
+  parser.add_argument("--error-rate", type=float, default=0.0)
+  parser.add_argument("--qps", type=float, default=0.0, help="Client QPS limit per API key (0 = off)")
+  parser.add_argument("--with-cache", action="store_true", help="Enable geocode cache and POI index")
+  parser.add_argument("--json", help="Write results to this JSON file")
+  return parser.parse_args(argv)
+
+
+def free_port() -> int:
+  with socket.socket() as sock:
+    sock.bind(("127.0.0.1", 0))
+    return sock.getsockname()[1]
+
+
+def start_stub(args: argparse.Namespace, port: int) -> subprocess.Popen:
+  process = subprocess.Popen([
+    sys.executable, os.path.join(BENCH_DIR, "stub_server.py"),
+    "--port", str(port),
+    "--latency-ms", str(args.latency_ms),
+    "--jitter-ms", str(args.jitter_ms),
+    "--throttle-rate", str(args.throttle_rate),
+    "--error-rate", str(args.error_rate),
+  ])
+
+  deadline = time.monotonic() + 15
+  while time.monotonic() < deadline:
+    try:
+      httpx.get(f"http://127.0.0.1:{port}/__stats", timeout=0.5)
+      return process
+    except httpx.TransportError:
+      time.sleep(0.1)
+
+  process.terminate()
+  raise RuntimeError("Stub server did not start")
+
+
+def configure_environment(args: argparse.Namespace, port: int, work_dir: str) -> None:
+  os.environ.update({
+    "NAVER_CLIENT_API": "bench",
+    "NAVER_CLIENT_SECRET": "bench",
+    "NAVER_MAPS_CLIENT_ID": "bench",
+    "NAVER_MAPS_CLIENT_SECRET": "bench",
+    "NAVER_MAPS_BASE_URL": f"http://127.0.0.1:{port}",
+    "NAVER_SEARCH_BASE_URL": f"http://127.0.0.1:{port}/v1/search",
+    "NAVER_MAPS_QPS": str(args.qps),
+    "NAVER_SEARCH_QPS": str(args.qps),
+    "NAVER_GEOCODE_CACHE": "1" if args.with_cache else "0",
+    "NAVER_GEOCODE_CACHE_PATH": os.path.join(work_dir, "geocode.sqlite3"),
+    "NAVER_POI_INDEX": "1" if args.with_cache else "0",
+    "NAVER_POI_INDEX_PATH": os.path.join(work_dir, "poi_index.sqlite3"),
+    "NAVER_LOG_DIR": os.path.join(work_dir, "logs"),
+  })
+
+
+def load_listings() -> List[Dict]:
+  with open(LISTINGS_FILE, encoding="utf-8") as f:
+    listings = json.load(f)
+  for listing in listings:
+    match = re.search(r"(\S+동)\s", listing["address"])
+    listing["dong"] = match.group(1) if match else "강남역"
+  return listings
+
+
+async def build_workload(server, listings: List[Dict]) -> Dict[str, List[Dict]]:
+  """
+  매물 주소를 기준으로 도구별 호출 인자를 구성 (좌표는 측정 전에 미리 지오코딩)
+  """
+  coordinates = []
+  for listing in listings:
+    response = await server.naver_maps_client.geocode(listing["address"], "kor", 1, 1)
+    address = response.addresses[0]
+    coordinates.append((float(address.x), float(address.y)))
+
+  categories = ["지하철역", "편의점", "병원", "학교"]
+  return {
+    "geocode": [{"address": listing["address"]} for listing in listings],
+    "localSearch": [
+      {"query": f"{listing['dong']} {category}"}
+      for listing in listings for category in categories
+    ],
+    "localSearchByCoordinate": [
+      {
+        "query": f"{listing['dong']} {category}",
+        "longitude": lon,
+        "latitude": lat,
+        "radius": 500,
+        "min_results": 3,
+      }
+      for listing, (lon, lat) in zip(listings, coordinates) for category in categories
+    ],
+  }
+
+
+def is_error(result) -> bool:
+  content = result[0] if isinstance(result, tuple) else result
+  try:
+    payload = json.loads(content[0].text)
+  except (IndexError, AttributeError, ValueError):
+    return False
+  return isinstance(payload, dict) and payload.get("success") is False
+
+
+async def run_case(server, stub_url: str, tool: str, calls: List[Dict], concurrency: int) -> Dict:
+  httpx.post(f"{stub_url}/__reset")
+  semaphore = asyncio.Semaphore(concurrency)
+  latencies = []
+  errors = 0
+
+  async def call(arguments: Dict) -> None:
+    nonlocal errors
+    async with semaphore:
+      started = time.perf_counter()
+      result = await server.mcp.call_tool(tool, arguments)
+      latencies.append(time.perf_counter() - started)
+      errors += is_error(result)
+
+  started = time.perf_counter()
+  await asyncio.gather(*(call(arguments) for arguments in calls))
+  elapsed = time.perf_counter() - started
+  upstream = httpx.get(f"{stub_url}/__stats").json()
+
+  latencies_ms = np.array(latencies) * 1000
+  return {
+    "tool": tool,
+    "concurrency": concurrency,
+    "calls": len(calls),
+    "errors": errors,
+    "p50_ms": round(float(np.percentile(latencies_ms, 50)), 1),
+    "p95_ms": round(float(np.percentile(latencies_ms, 95)), 1),
+    "p99_ms": round(float(np.percentile(latencies_ms, 99)), 1),
+    "rps": round(len(calls) / elapsed, 1),
+    "upstream_per_call": round(upstream["requests"] / len(calls), 2),
+    "upstream_throttled": upstream["throttled"],
+  }
+
+
+def print_table(results: List[Dict]) -> None:
+  columns = [
+    "tool", "concurrency", "calls", "errors", "p50_ms", "p95_ms", "p99_ms", "rps",
+    "upstream_per_call", "upstream_throttled",
+  ]
+  widths = [max(len(column), *(len(str(row[column])) for row in results)) for column in columns]
+  print("  ".join(column.ljust(width) for column, width in zip(columns, widths)))
+  for row in results:
+    print("  ".join(str(row[column]).ljust(width) for column, width in zip(columns, widths)))
+
+
+async def run(args: argparse.Namespace, stub_url: str) -> List[Dict]:
+  sys.path.insert(0, os.path.join(PROJECT_DIR, "src"))
+  from naver_map_mcp import server
+
+  logging.getLogger("httpx").setLevel(logging.WARNING)
+
+  try:
+    server.initialize()
+    workload = await build_workload(server, load_listings())
+    results = []
+    for tool in args.tools:
+      calls = [workload[tool][i % len(workload[tool])] for i in range(args.requests)]
+      for concurrency in args.concurrency:
+        results.append(await run_case(server, stub_url, tool, calls, concurrency))
+    return results
+  finally:
+    if server.naver_maps_client is not None:
+      await server.naver_maps_client.aclose()
+
+
+def main(argv=None):
+  args = parse_args(argv)
+  port = free_port()
+  stub = start_stub(args, port)
+  try:
+    with tempfile.TemporaryDirectory() as work_dir:
+      configure_environment(args, port, work_dir)
+      results = asyncio.run(run(args, f"http://127.0.0.1:{port}"))
+  finally:
+    stub.terminate()
+    stub.wait()
+
+  print_table(results)
+  if args.json:
+    with open(args.json, "w", encoding="utf-8") as f:
+      json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,140 @@
+"""
+naver_map_mcp 콜드 스타트 벤치마크
+
+에이전트가 필요할 때마다 stdio로 서버를 띄우는 상황을 재현하여 다음 구간을 측정
+- import: 서버 모듈 import 시간 (별도 프로세스)
+- initialize: 프로세스 시작부터 MCP initialize 응답까지
+- first_tool: initialize 이후 첫 도구 호출(geocode) 결과까지
+- total: 프로세스 시작부터 첫 도구 결과까지
+
+업스트림은 대체 서버(stub_server.py)를 사용하며 캐시는 임시 디렉터리에 생성
+
+Usage:
+  python bench/startup.py --runs 10
+  python bench/startup.py --runs 5 --json startup_result.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from mcp import ClientSession, StdioServerParameters, stdio_client
+from typing import Dict, List
+
+from benchmark import PROJECT_DIR, free_port, start_stub
+
+
+SRC_DIR = os.path.join(PROJECT_DIR, "src")
+PHASES = ["import_ms", "initialize_ms", "first_tool_ms", "total_ms"]
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+  parser = argparse.ArgumentParser(description="naver_map_mcp cold-start benchmark")
+  parser.add_argument("--runs", type=int, default=5)
+  parser.add_argument("--address", default="서울특별시 강남구 역삼동 737")
+  parser.add_argument("--latency-ms", type=float, default=50.0)
+  parser.add_argument("--json", help="Write results to this JSON file")
+  args = parser.parse_args(argv)
+  args.jitter_ms = 0.0
+  args.throttle_rate = 0.0
+  args.error_rate = 0.0
+  return args
+
+
+def server_env(port: int, work_dir: str) -> Dict[str, str]:
+  return {
+    **os.environ,
+    "PYTHONPATH": SRC_DIR,
+    "NAVER_CLIENT_API": "bench",
+    "NAVER_CLIENT_SECRET": "bench",
+    "NAVER_MAPS_CLIENT_ID": "bench",
+    "NAVER_MAPS_CLIENT_SECRET": "bench",
+    "NAVER_MAPS_BASE_URL": f"http://127.0.0.1:{port}",
+    "NAVER_SEARCH_BASE_URL": f"http://127.0.0.1:{port}/v1/search",
+    "NAVER_GEOCODE_CACHE_PATH": os.path.join(work_dir, "geocode.sqlite3"),
+    "NAVER_POI_INDEX_PATH": os.path.join(work_dir, "poi_index.sqlite3"),
+    "NAVER_LOG_DIR": os.path.join(work_dir, "logs"),
+  }
+
+
+def measure_import(env: Dict[str, str]) -> float:
+  code = (
+    "import time; started = time.perf_counter(); import naver_map_mcp.server; "
+    "print((time.perf_counter() - started) * 1000)"
+  )
+  output = subprocess.run(
+    [sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True
+  )
+  return float(output.stdout.strip())
+
+
+async def measure_session(env: Dict[str, str], address: str) -> Dict[str, float]:
+  params = StdioServerParameters(command=sys.executable, args=["-m", "naver_map_mcp"], env=env)
+
+  started = time.perf_counter()
+  with open(os.devnull, "w") as errlog:
+    async with stdio_client(params, errlog=errlog) as (read, write):
+      async with ClientSession(read, write) as session:
+        await session.initialize()
+        initialized = time.perf_counter()
+        result = await session.call_tool("geocode", {"address": address, "count": 1})
+        finished = time.perf_counter()
+
+  if result.isError or '"success": false' in result.content[0].text:
+    raise RuntimeError(f"First tool call failed: {result.content[0].text}")
+  return {
+    "initialize_ms": (initialized - started) * 1000,
+    "first_tool_ms": (finished - initialized) * 1000,
+    "total_ms": (finished - started) * 1000,
+  }
+
+
+def summarize(runs: List[Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+  summary = {}
+  for phase in PHASES:
+    values = np.array([run[phase] for run in runs])
+    summary[phase] = {
+      "min": round(float(values.min()), 1),
+      "p50": round(float(np.percentile(values, 50)), 1),
+      "max": round(float(values.max()), 1),
+    }
+  return summary
+
+
+def main(argv=None):
+  args = parse_args(argv)
+  port = free_port()
+  stub = start_stub(args, port)
+  runs = []
+  try:
+    for _ in range(args.runs):
+      # 매 실행마다 새 임시 디렉터리를 사용하여 캐시가 없는 콜드 스타트를 측정
+      with tempfile.TemporaryDirectory() as work_dir:
+        env = server_env(port, work_dir)
+        run = {"import_ms": measure_import(env)}
+        run.update(asyncio.run(measure_session(env, args.address)))
+        runs.append(run)
+  finally:
+    stub.terminate()
+    stub.wait()
+
+  summary = summarize(runs)
+  print(f"{'phase':<14}{'min':>10}{'p50':>10}{'max':>10}")
+  for phase in PHASES:
+    row = summary[phase]
+    print(f"{phase:<14}{row['min']:>10}{row['p50']:>10}{row['max']:>10}")
+
+  if args.json:
+    with open(args.json, "w", encoding="utf-8") as f:
+      json.dump({"runs": runs, "summary": summary}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,255 @@
+"""
+네이버 지도/검색 API 대체 서버 (record/replay)
+
+- replay: 녹화된 응답을 돌려주고, 녹화가 없으면 강남권 좌표 기반의 결정적인 합성 응답을 생성
+- record: 실제 네이버 API로 요청을 전달하고 응답을 녹화 파일에 저장
+- 지연 시간, 420 쓰로틀링, 500 오류를 확률적으로 주입 가능
+
+NaverMapsClient는 다음 환경변수로 이 서버를 바라보게 할 수 있음
+  NAVER_MAPS_BASE_URL=http://127.0.0.1:8765
+  NAVER_SEARCH_BASE_URL=http://127.0.0.1:8765/v1/search
+
+Usage:
+  python bench/stub_server.py --port 8765 --latency-ms 80 --jitter-ms 40 --throttle-rate 0.02
+  python bench/stub_server.py --mode record   # 실제 자격 증명이 필요
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+
+import httpx
+import uvicorn
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from typing import Dict, Optional, Tuple
+
+
+RECORDINGS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "recordings")
+
+UPSTREAM = {
+  "geocode": "https://maps.apigw.ntruss.com/map-geocode/v2/geocode",
+  "local": "https://openapi.naver.com/v1/search/local.json",
+}
+
+# 합성 응답에 사용하는 동별 중심 좌표 (경도, 위도)
+DONG_CENTERS = {
+  "역삼동": (127.0366, 37.5006),
+  "대치동": (127.0628, 37.4993),
+  "삼성동": (127.0565, 37.5140),
+  "청담동": (127.0474, 37.5245),
+  "개포동": (127.0665, 37.4800),
+  "도곡동": (127.0456, 37.4889),
+  "반포동": (127.0040, 37.5050),
+  "서초동": (127.0190, 37.4900),
+  "잠실동": (127.0820, 37.5100),
+  "문정동": (127.1220, 37.4850),
+}
+DEFAULT_CENTER = (127.0276, 37.4979)  # 강남역
+
+
+def _seed(*parts) -> int:
+  return int(hashlib.sha1("|".join(map(str, parts)).encode()).hexdigest()[:12], 16)
+
+
+def _center(text: str) -> Tuple[float, float]:
+  for dong, center in DONG_CENTERS.items():
+    if dong in text:
+      return center
+  return DEFAULT_CENTER
+
+
+def synthetic_geocode(params: Dict) -> Dict:
+  query = params.get("query", "")
+  rng = random.Random(_seed("geocode", query))
+  lon, lat = _center(query)
+  lon += rng.uniform(-0.003, 0.003)
+  lat += rng.uniform(-0.003, 0.003)
+  return {
+    "status": "OK",
+    "meta": {"totalCount": 1, "page": int(params.get("page", 1)), "count": 1},
+    "addresses": [{
+      "roadAddress": query,
+      "jibunAddress": query,
+      "englishAddress": "",
+      "x": f"{lon:.7f}",
+      "y": f"{lat:.7f}",
+      "distance": 0.0,
+    }],
+    "errorMessage": "",
+  }
+
+
+def synthetic_local(params: Dict) -> Dict:
+  query = params.get("query", "")
+  display = int(params.get("display", 5))
+  start = int(params.get("start", 1))
+  total = 20 + _seed("total", query) % 80
+  lon, lat = _center(query)
+
+  items = []
+  for position in range(start, min(total, start + display - 1) + 1):
+    rng = random.Random(_seed("local", query, position))
+    items.append({
+      "title": f"<b>{query}</b> {position}",
+      "link": "",
+      "category": "합성>대체서버",
+      "description": "",
+      "address": f"서울특별시 강남구 {position}",
+      "roadAddress": f"서울특별시 강남구 테스트로 {position}",
+      "mapx": str(round((lon + rng.uniform(-0.015, 0.015)) * 10_000_000)),
+      "mapy": str(round((lat + rng.uniform(-0.015, 0.015)) * 10_000_000)),
+    })
+
+  return {"total": total, "start": start, "display": len(items), "items": items}
+
+
+class StubState:
+  def __init__(
+    self,
+    mode: str,
+    latency_ms: float,
+    jitter_ms: float,
+    throttle_rate: float,
+    error_rate: float,
+    strict: bool,
+  ):
+    self.mode = mode
+    self.latency_ms = latency_ms
+    self.jitter_ms = jitter_ms
+    self.throttle_rate = throttle_rate
+    self.error_rate = error_rate
+    self.strict = strict
+    self.recordings: Dict[str, Dict] = {}
+    self.counters: Dict[str, int] = {}
+    self.upstream: Optional[httpx.AsyncClient] = None
+    for endpoint in UPSTREAM:
+      self.recordings[endpoint] = self._load(endpoint)
+    self.reset()
+
+  def reset(self) -> None:
+    self.counters = {
+      "requests": 0,
+      "geocode": 0,
+      "local": 0,
+      "throttled": 0,
+      "errors": 0,
+      "recorded_hits": 0,
+      "synthetic": 0,
+    }
+
+  @staticmethod
+  def _path(endpoint: str) -> str:
+    return os.path.join(RECORDINGS_DIR, f"{endpoint}.json")
+
+  def _load(self, endpoint: str) -> Dict:
+    path = self._path(endpoint)
+    if not os.path.exists(path):
+      return {}
+    with open(path, encoding="utf-8") as f:
+      return json.load(f)
+
+  def _save(self, endpoint: str) -> None:
+    os.makedirs(RECORDINGS_DIR, exist_ok=True)
+    with open(self._path(endpoint), "w", encoding="utf-8") as f:
+      json.dump(self.recordings[endpoint], f, ensure_ascii=False, indent=2)
+
+  @staticmethod
+  def key(params: Dict) -> str:
+    return "&".join(f"{name}={params[name]}" for name in sorted(params))
+
+
+def build_app(state: StubState) -> Starlette:
+  async def handle(endpoint: str, request: Request) -> JSONResponse:
+    params = dict(request.query_params)
+    state.counters["requests"] += 1
+    state.counters[endpoint] += 1
+
+    delay = state.latency_ms + random.uniform(-state.jitter_ms, state.jitter_ms)
+    if delay > 0:
+      await asyncio.sleep(delay / 1000)
+
+    if random.random() < state.throttle_rate:
+      state.counters["throttled"] += 1
+      return JSONResponse({"errorMessage": "Rate limit exceeded"}, status_code=420)
+    if random.random() < state.error_rate:
+      state.counters["errors"] += 1
+      return JSONResponse({"errorMessage": "Injected server error"}, status_code=500)
+
+    key = state.key(params)
+    if state.mode == "record":
+      if state.upstream is None:
+        state.upstream = httpx.AsyncClient(http2=True)
+      forwarded = {
+        name: value
+        for name, value in request.headers.items()
+        if name.lower().startswith(("x-naver-", "x-ncp-"))
+      }
+      response = await state.upstream.get(UPSTREAM[endpoint], params=params, headers=forwarded)
+      if response.status_code == 200:
+        state.recordings[endpoint][key] = response.json()
+        state._save(endpoint)
+      return JSONResponse(response.json(), status_code=response.status_code)
+
+    if key in state.recordings[endpoint]:
+      state.counters["recorded_hits"] += 1
+      return JSONResponse(state.recordings[endpoint][key])
+    if state.strict:
+      return JSONResponse({"errorMessage": f"No recording for {key}"}, status_code=404)
+
+    state.counters["synthetic"] += 1
+    payload = synthetic_geocode(params) if endpoint == "geocode" else synthetic_local(params)
+    return JSONResponse(payload)
+
+  async def geocode(request: Request) -> JSONResponse:
+    return await handle("geocode", request)
+
+  async def local(request: Request) -> JSONResponse:
+    return await handle("local", request)
+
+  async def stats(request: Request) -> JSONResponse:
+    return JSONResponse(state.counters)
+
+  async def reset(request: Request) -> JSONResponse:
+    state.reset()
+    return JSONResponse(state.counters)
+
+  return Starlette(routes=[
+    Route("/map-geocode/v2/geocode", geocode),
+    Route("/v1/search/local.json", local),
+    Route("/__stats", stats),
+    Route("/__reset", reset, methods=["POST"]),
+  ])
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+  parser = argparse.ArgumentParser(description="Naver Maps/Search API stand-in server")
+  parser.add_argument("--host", default="127.0.0.1")
+  parser.add_argument("--port", type=int, default=8765)
+  parser.add_argument("--mode", choices=["replay", "record"], default="replay")
+  parser.add_argument("--latency-ms", type=float, default=50.0, help="Mean injected latency")
+  parser.add_argument("--jitter-ms", type=float, default=20.0, help="Uniform latency jitter")
+  parser.add_argument("--throttle-rate", type=float, default=0.0, help="Probability of HTTP 420")
+  parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of HTTP 500")
+  parser.add_argument(
+    "--strict", action="store_true", help="Return 404 instead of synthetic data on replay misses"
+  )
+  return parser.parse_args(argv)
+
+
+def main(argv=None):
+  args = parse_args(argv)
+  state = StubState(
+    args.mode, args.latency_ms, args.jitter_ms, args.throttle_rate, args.error_rate, args.strict
+  )
+  uvicorn.run(build_app(state), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+  main()
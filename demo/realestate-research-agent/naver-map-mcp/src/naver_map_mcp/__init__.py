@@ -1,8 +1,45 @@
-from naver_map_mcp.server import mcp
+import argparse
+import os
 
 
 def main():
-  mcp.run()
+  parser = argparse.ArgumentParser(description="Naver Maps MCP server")
+  parser.add_argument(
+    "--transport",
+    choices=["stdio", "sse", "streamable-http"],
+    default=os.getenv("NAVER_MCP_TRANSPORT", "stdio"),
+  )
+  parser.add_argument("--host", default=os.getenv("NAVER_MCP_HOST", "127.0.0.1"))
+  parser.add_argument("--port", type=int, default=int(os.getenv("NAVER_MCP_PORT", 8000)))
+  parser.add_argument(
+    "--workers",
+    type=int,
+    default=int(os.getenv("NAVER_MCP_WORKERS", 1)),
+    help="Worker processes for the streamable-http transport",
+  )
+  args = parser.parse_args()
+
+  if args.transport == "streamable-http":
+    import uvicorn
+
+    # 워커 프로세스는 이 환경변수로 다중 워커 실행 여부를 확인 (워커별 로그 파일)
+    os.environ["NAVER_MCP_WORKERS"] = str(args.workers)
+    uvicorn.run(
+      "naver_map_mcp.server:create_http_app",
+      factory=True,
+      host=args.host,
+      port=args.port,
+      workers=args.workers,
+      log_level="warning",
+    )
+  else:
+    # stdio 모드는 서버 모듈만 불러오고, 무거운 초기화는 첫 도구 호출 시 수행
+    import anyio
+    from naver_map_mcp.server import mcp, run_async
+
+    mcp.settings.host = args.host
+    mcp.settings.port = args.port
+    anyio.run(run_async, args.transport)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,76 @@
+import math
+import numpy as np
+
+from typing import Sequence, Tuple
+
+EARTH_RADIUS = 6371000  # 지구 반경 (미터)
+
+
+def calculate_distance(lon1: float, lat1: float, lon2: float, lat2: float) -> float:
+  """
+  두 지점 간의 거리를 미터 단위로 계산 (Haversine 공식)
+  """
+  R = EARTH_RADIUS
+  
+  # 라디안으로 변환
+  lat1_rad = math.radians(lat1)
+  lon1_rad = math.radians(lon1)
+  lat2_rad = math.radians(lat2)
+  lon2_rad = math.radians(lon2)
+  
+  # 위도와 경도의 차이
+  dlat = lat2_rad - lat1_rad
+  dlon = lon2_rad - lon1_rad
+  
+  # Haversine 공식
+  a = math.sin(dlat/2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon/2)**2
+  c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
+  distance = R * c
+  
+  return distance
+
+
+def bounding_box(lon: float, lat: float, radius: float) -> Tuple[float, float, float, float]:
+  """
+  반경 원을 모두 포함하는 위경도 사각형 (min_lon, min_lat, max_lon, max_lat)
+  경도 폭은 원의 가장 높은 위도 기준으로 계산하여 경계의 장소를 놓치지 않도록 함
+  """
+  dlat = math.degrees(radius / EARTH_RADIUS)
+  widest_lat = min(89.9, abs(lat) + dlat)
+  dlon = math.degrees(radius / (EARTH_RADIUS * math.cos(math.radians(widest_lat))))
+  return lon - dlon, lat - dlat, lon + dlon, lat + dlat
+
+
+def haversine_distances(
+  lon: float, lat: float, lons: np.ndarray, lats: np.ndarray
+) -> np.ndarray:
+  """
+  중심 좌표에서 여러 지점까지의 거리를 미터 단위로 한 번에 계산 (벡터화된 Haversine 공식)
+  """
+  lat_rad = math.radians(lat)
+  lats_rad = np.radians(lats)
+  dlat = lats_rad - lat_rad
+  dlon = np.radians(lons) - math.radians(lon)
+
+  a = np.sin(dlat / 2) ** 2 + math.cos(lat_rad) * np.cos(lats_rad) * np.sin(dlon / 2) ** 2
+  return 2 * EARTH_RADIUS * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def within_radius(
+  lon: float, lat: float, lons: Sequence[float], lats: Sequence[float], radius: float
+) -> Tuple[np.ndarray, np.ndarray]:
+  """
+  반경 내에 있는 지점의 인덱스(입력 순서 유지)와 거리를 반환
+  1. 위경도 사각형으로 후보를 먼저 걸러내고
+  2. 남은 후보에 대해서만 벡터화된 Haversine 거리를 계산
+  """
+  lons = np.asarray(lons, dtype=np.float64)
+  lats = np.asarray(lats, dtype=np.float64)
+  min_lon, min_lat, max_lon, max_lat = bounding_box(lon, lat, radius)
+
+  candidates = np.flatnonzero(
+    (lons >= min_lon) & (lons <= max_lon) & (lats >= min_lat) & (lats <= max_lat)
+  )
+  distances = haversine_distances(lon, lat, lons[candidates], lats[candidates])
+  inside = distances <= radius
+  return candidates[inside], distances[inside]
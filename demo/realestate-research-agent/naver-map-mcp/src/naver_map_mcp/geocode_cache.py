@@ -0,0 +1,271 @@
+import re
+import sqlite3
+import time
+
+from naver_map_mcp.sqlite_worker import SqliteWorker
+from typing import Dict, List, Optional, Set
+
+
+# 광역자치단체 명칭 통일 (정식 명칭/약칭 → 약칭)
+SIDO_ALIASES = {
+  "서울특별시": "서울",
+  "서울시": "서울",
+  "부산광역시": "부산",
+  "부산시": "부산",
+  "대구광역시": "대구",
+  "대구시": "대구",
+  "인천광역시": "인천",
+  "인천시": "인천",
+  "광주광역시": "광주",
+  "대전광역시": "대전",
+  "대전시": "대전",
+  "울산광역시": "울산",
+  "울산시": "울산",
+  "세종특별자치시": "세종",
+  "세종시": "세종",
+  "경기도": "경기",
+  "강원특별자치도": "강원",
+  "강원도": "강원",
+  "충청북도": "충북",
+  "충청남도": "충남",
+  "전북특별자치도": "전북",
+  "전라북도": "전북",
+  "전라남도": "전남",
+  "경상북도": "경북",
+  "경상남도": "경남",
+  "제주특별자치도": "제주",
+  "제주도": "제주",
+}
+
+# "101동 1501호", "B동 805호", "제3층", "1501호" 같은 동/호/층 표기
+_UNIT_PATTERN = re.compile(r"(?:\s+제?\s?[0-9A-Za-z]+(?:-[0-9]+)?\s?(?:동|호|층))+$")
+# 도로명 주소 뒤의 "(역삼동, 강남파이낸스센터)" 같은 참고항목
+_PARENTHESES_PATTERN = re.compile(r"\([^)]*\)")
+# "123 - 45" → "123-45"
+_LOT_HYPHEN_PATTERN = re.compile(r"(\d)\s*-\s*(\d)")
+# "123번지" → "123"
+_BUNJI_PATTERN = re.compile(r"(\d)\s*번지")
+# "산 12-3" → "산12-3"
+_SAN_PATTERN = re.compile(r"(^|\s)산\s+(\d)")
+# "역삼로 3길" → "역삼로3길", "테헤란로 12 번길" → "테헤란로12번길"
+_ROAD_GIL_PATTERN = re.compile(r"(로|길)\s*(\d+)\s*(번?길)")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+# 건물번호/지번 토큰 ("152", "737-1", "산12-3")
+_NUMBER_TOKEN_PATTERN = re.compile(r"^산?\d+(?:-\d+)?$")
+
+
+def normalize_address(address: str) -> str:
+  """
+  캐시 키로 사용할 수 있도록 주소를 정규화
+  - 동/호/층 등 세대 단위 표기 제거
+  - 괄호 참고항목, 쉼표 제거 및 공백 정리
+  - 시/도 명칭, 번지/산/도로명 길 표기 통일
+  """
+  normalized = _PARENTHESES_PATTERN.sub(" ", address).replace(",", " ")
+  normalized = _WHITESPACE_PATTERN.sub(" ", normalized).strip()
+
+  tokens = normalized.split(" ")
+  if tokens and tokens[0] in SIDO_ALIASES:
+    tokens[0] = SIDO_ALIASES[tokens[0]]
+  normalized = " ".join(tokens)
+
+  normalized = _BUNJI_PATTERN.sub(r"\1", normalized)
+  normalized = _LOT_HYPHEN_PATTERN.sub(r"\1-\2", normalized)
+  normalized = _SAN_PATTERN.sub(r"\1산\2", normalized)
+  normalized = _ROAD_GIL_PATTERN.sub(r"\1\2\3", normalized)
+  # 주소 끝의 세대 표기를 한 번에 제거 ("101동 1501호" 모두 제거)
+  normalized = _UNIT_PATTERN.sub("", normalized)
+
+  return _WHITESPACE_PATTERN.sub(" ", normalized).strip()
+
+
+def address_aliases(address: str) -> Set[str]:
+  """
+  지오코딩 응답의 주소로 만들 수 있는 캐시 키용 정규화 주소 목록
+  도로명 주소 뒤에 붙는 건물명("테헤란로 152 강남파이낸스센터")을 뗀 형태도 포함
+  """
+  if not address:
+    return set()
+  normalized = normalize_address(address)
+  aliases = {normalized}
+  tokens = normalized.split(" ")
+  numbers = [i for i, token in enumerate(tokens) if _NUMBER_TOKEN_PATTERN.match(token)]
+  if numbers and numbers[-1] < len(tokens) - 1:
+    aliases.add(" ".join(tokens[:numbers[-1] + 1]))
+  return aliases
+
+
+class GeocodeCache:
+  """
+  정규화된 주소를 키로 하는 SQLite 기반 지오코딩 결과 캐시
+  - TTL이 지난 항목은 조회 시 무시하고 삭제
+  - 최대 항목 수를 넘으면 가장 오래 전에 사용된 항목부터 제거
+  - DB 작업은 전용 스레드(SqliteWorker)에서 실행하며, 비동기 코드는 aget/aput/astats를 사용
+  - 조회 시각(accessed_at) 갱신은 모아 두었다가 touch_batch건 또는 touch_interval초마다 한 번에 기록
+  - 항목 수는 메모리에서 추정하고, 한도를 넘었다고 추정될 때만 실제 개수를 세어 제거
+  """
+
+  def __init__(
+    self,
+    path: str,
+    ttl_seconds: float = 30 * 24 * 3600,
+    max_entries: int = 50_000,
+    touch_batch: int = 100,
+    touch_interval: float = 5.0,
+  ):
+    self.path = path
+    self.ttl_seconds = ttl_seconds
+    self.max_entries = max_entries
+    self.touch_batch = touch_batch
+    self.touch_interval = touch_interval
+    self.hits = 0
+    self.misses = 0
+    self.evictions = 0
+    self.errors = 0
+    self._touched: Dict[str, float] = {}
+    self._last_flush = time.time()
+
+    self._worker = SqliteWorker(path)
+    self._conn = self._worker.conn
+    self._size = self._worker.call(self._setup)
+
+  def _setup(self) -> int:
+    self._conn.execute(
+      """
+      CREATE TABLE IF NOT EXISTS geocode_cache (
+        cache_key TEXT PRIMARY KEY,
+        payload TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        accessed_at REAL NOT NULL
+      )
+      """
+    )
+    self._conn.execute(
+      "CREATE INDEX IF NOT EXISTS geocode_cache_accessed_at ON geocode_cache (accessed_at)"
+    )
+    self._conn.commit()
+    (size,) = self._conn.execute("SELECT COUNT(*) FROM geocode_cache").fetchone()
+    return size
+
+  @staticmethod
+  def make_key(address: str, language: str, page: int, count: int) -> str:
+    return GeocodeCache.make_normalized_key(normalize_address(address), language, page, count)
+
+  @staticmethod
+  def make_normalized_key(normalized: str, language: str, page: int, count: int) -> str:
+    return f"{language}|{page}|{count}|{normalized}"
+
+  def get(self, key: str) -> Optional[str]:
+    """
+    캐시 조회 (전용 스레드에서 실행)
+    """
+    now = time.time()
+    row = self._conn.execute(
+      "SELECT payload, created_at FROM geocode_cache WHERE cache_key = ?", (key,)
+    ).fetchone()
+
+    if row is None:
+      self.misses += 1
+      return None
+
+    payload, created_at = row
+    if now - created_at > self.ttl_seconds:
+      self._conn.execute("DELETE FROM geocode_cache WHERE cache_key = ?", (key,))
+      self._conn.commit()
+      self._touched.pop(key, None)
+      self._size = max(self._size - 1, 0)
+      self.misses += 1
+      return None
+
+    self.hits += 1
+    self._touched[key] = now
+    if len(self._touched) >= self.touch_batch or now - self._last_flush >= self.touch_interval:
+      self._flush_touches()
+    return payload
+
+  def _flush_touches(self) -> None:
+    self._last_flush = time.time()
+    if not self._touched:
+      return
+    touched, self._touched = self._touched, {}
+    self._conn.executemany(
+      "UPDATE geocode_cache SET accessed_at = ? WHERE cache_key = ?",
+      [(accessed_at, key) for key, accessed_at in touched.items()],
+    )
+    self._conn.commit()
+
+  def put(self, keys: List[str], payload: str) -> None:
+    """
+    같은 결과를 여러 키(주소와 그 별칭)로 한 트랜잭션에 저장 (전용 스레드에서 실행)
+    """
+    now = time.time()
+    with self._conn:
+      self._conn.executemany(
+        "INSERT OR REPLACE INTO geocode_cache (cache_key, payload, created_at, accessed_at) "
+        "VALUES (?, ?, ?, ?)",
+        [(key, payload, now, now) for key in keys],
+      )
+      # 교체된 키도 더하므로 실제보다 크게 추정될 수 있으며, 이때만 실제 개수를 셈
+      self._size += len(keys)
+      if self._size > self.max_entries:
+        self._evict()
+
+  def _evict(self) -> None:
+    (size,) = self._conn.execute("SELECT COUNT(*) FROM geocode_cache").fetchone()
+    overflow = size - self.max_entries
+    if overflow > 0:
+      self._conn.execute(
+        "DELETE FROM geocode_cache WHERE cache_key IN "
+        "(SELECT cache_key FROM geocode_cache ORDER BY accessed_at ASC LIMIT ?)",
+        (overflow,),
+      )
+      self.evictions += overflow
+    self._size = min(size, self.max_entries)
+
+  async def aget(self, key: str) -> Optional[str]:
+    """
+    캐시 조회. 다른 프로세스의 잠금 등으로 DB 작업이 실패하면 캐시 미스로 처리
+    """
+    try:
+      return await self._worker.run(self.get, key)
+    except sqlite3.Error:
+      self.errors += 1
+      self.misses += 1
+      return None
+
+  async def aput(self, keys: List[str], payload: str) -> None:
+    """
+    캐시 저장. 실패해도 응답에는 영향을 주지 않음
+    """
+    try:
+      await self._worker.run(self.put, keys, payload)
+    except sqlite3.Error:
+      self.errors += 1
+
+  def clear(self) -> None:
+    def clear() -> None:
+      self._touched = {}
+      self._conn.execute("DELETE FROM geocode_cache")
+      self._conn.commit()
+      self._size = 0
+
+    self._worker.call(clear)
+
+  def close(self) -> None:
+    self._worker.call(self._flush_touches)
+    self._worker.close()
+
+  def stats(self) -> Dict:
+    (size,) = self._conn.execute("SELECT COUNT(*) FROM geocode_cache").fetchone()
+    lookups = self.hits + self.misses
+    return {
+      "entries": size,
+      "hits": self.hits,
+      "misses": self.misses,
+      "evictions": self.evictions,
+      "errors": self.errors,
+      "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+    }
+
+  async def astats(self) -> Dict:
+    return await self._worker.run(self.stats)
@@ -0,0 +1,98 @@
+import atexit
+import dataclasses
+import json
+import logging
+import os
+import queue
+import random
+
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any
+
+
+def _to_jsonable(value: Any) -> Any:
+  if hasattr(value, "model_dump"):
+    return value.model_dump()
+  if dataclasses.is_dataclass(value):
+    return dataclasses.asdict(value)
+  return str(value)
+
+
+class JsonLinesFormatter(logging.Formatter):
+  """
+  로그 레코드를 한 줄짜리 JSON으로 변환
+  extra={"data": ...}로 전달된 객체는 이 시점(백그라운드 스레드)에서 처음 직렬화됨
+  """
+
+  def format(self, record: logging.LogRecord) -> str:
+    entry = {
+      "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+      "level": record.levelname,
+      "logger": record.name,
+      "message": record.getMessage(),
+    }
+    data = getattr(record, "data", None)
+    if data is not None:
+      entry["data"] = data
+    if record.exc_info:
+      entry["exc_info"] = self.formatException(record.exc_info)
+    return json.dumps(entry, ensure_ascii=False, default=_to_jsonable)
+
+
+class SamplingFilter(logging.Filter):
+  """
+  INFO 이하 레코드는 sample_rate 비율만 남기고, WARNING 이상은 항상 기록
+  """
+
+  def __init__(self, sample_rate: float):
+    super().__init__()
+    self.sample_rate = sample_rate
+
+  def filter(self, record: logging.LogRecord) -> bool:
+    return record.levelno >= logging.WARNING or random.random() < self.sample_rate
+
+
+class DeferredQueueHandler(QueueHandler):
+  """
+  레코드를 포맷하지 않고 그대로 큐에 넣는 핸들러 (직렬화와 디스크 I/O는 리스너 스레드에서 수행)
+  """
+
+  def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+    return record
+
+
+def setup_logging(
+  name: str,
+  log_file: str,
+  level: str = "INFO",
+  sample_rate: float = 1.0,
+  max_bytes: int = 10 * 1024 * 1024,
+  backup_count: int = 5,
+) -> logging.Logger:
+  """
+  이벤트 루프를 막지 않는 큐 기반 JSON Lines 로거 구성
+  - 호출 측은 레코드를 큐에 넣기만 하고, 포맷/쓰기는 QueueListener 스레드가 담당
+  - 로그 파일은 max_bytes 크기마다 교체되며 backup_count개까지 보관
+  """
+  os.makedirs(os.path.dirname(os.path.abspath(log_file)), exist_ok=True)
+
+  file_handler = RotatingFileHandler(
+    log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+  )
+  file_handler.setFormatter(JsonLinesFormatter())
+
+  log_queue = queue.SimpleQueue()
+  queue_handler = DeferredQueueHandler(log_queue)
+  queue_handler.addFilter(SamplingFilter(sample_rate))
+
+  logger = logging.getLogger(name)
+  logger.setLevel(level)
+  logger.propagate = False
+  logger.addHandler(queue_handler)
+
+  listener = QueueListener(log_queue, file_handler)
+  listener.start()
+  atexit.register(listener.stop)
+
+  return logger
@@ -1,15 +1,41 @@
+import asyncio
 import httpx
+import json
 import os
+import random
+import time
 
-from naver_map_mcp.models import GeocodeResponse, LocalSearchResponse
-from typing import Dict, Literal
+from naver_map_mcp.models import GeocodeResponse
+from naver_map_mcp.places import PlacePage
+from naver_map_mcp.rate_limiter import TokenBucket
+from naver_map_mcp.singleflight import SingleFlight
+from typing import Dict, Literal, Optional, Tuple
+
+# 자동 재시도 대상 상태 코드 (5xx는 별도로 모두 재시도)
+RETRYABLE_STATUS_CODES = {420, 429}
+
+
+def _env_int(name: str, default: int) -> int:
+  value = os.getenv(name)
+  return int(value) if value else default
+
+
+def _env_float(name: str, default: float) -> float:
+  value = os.getenv(name)
+  return float(value) if value else default
 
 
 class NaverMapsClient:
   MAP_BASE_URL = "https://maps.apigw.ntruss.com"
   SEARCH_BASE_URL = "https://openapi.naver.com/v1/search"
 
-  def __init__(self):
+  def __init__(
+    self,
+    limits: Optional[httpx.Limits] = None,
+    timeout: Optional[httpx.Timeout] = None,
+    map_base_url: Optional[str] = None,
+    search_base_url: Optional[str] = None,
+  ):
     naver_client_id = os.getenv("NAVER_CLIENT_API")
     naver_client_secret = os.getenv("NAVER_CLIENT_SECRET")
     if not naver_client_id or not naver_client_secret:
@@ -31,6 +57,76 @@ class NaverMapsClient:
       "Accept": "application/json",
     }
 
+    # 로컬 대체 서버(bench/stub_server.py) 등으로 업스트림 주소를 바꿀 수 있음
+    self.map_base_url = map_base_url or os.getenv("NAVER_MAPS_BASE_URL") or self.MAP_BASE_URL
+    self.search_base_url = (
+      search_base_url or os.getenv("NAVER_SEARCH_BASE_URL") or self.SEARCH_BASE_URL
+    )
+
+    # 업스트림 호스트별로 하나씩 유지하는 커넥션 풀 설정 (환경변수로 조정 가능)
+    self.limits = limits or httpx.Limits(
+      max_connections=_env_int("NAVER_HTTP_MAX_CONNECTIONS", 20),
+      max_keepalive_connections=_env_int("NAVER_HTTP_MAX_KEEPALIVE", 10),
+      keepalive_expiry=_env_float("NAVER_HTTP_KEEPALIVE_EXPIRY", 60.0),
+    )
+    self.timeout = timeout or httpx.Timeout(
+      _env_float("NAVER_HTTP_TIMEOUT", 10.0),
+      connect=_env_float("NAVER_HTTP_CONNECT_TIMEOUT", 5.0),
+    )
+    self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    # API 키별 토큰 버킷 (기본값 0은 제한 없음, QPS를 설정하면 사용)
+    self._rate_limiters: Dict[str, Optional[TokenBucket]] = {
+      self.map_base_url: self._token_bucket("NAVER_MAPS_QPS", "NAVER_MAPS_BURST"),
+      self.search_base_url: self._token_bucket("NAVER_SEARCH_QPS", "NAVER_SEARCH_BURST"),
+    }
+
+    # 420/429/5xx 및 네트워크 오류 재시도 설정
+    self.max_retries = _env_int("NAVER_HTTP_MAX_RETRIES", 3)
+    self.backoff_base = _env_float("NAVER_HTTP_BACKOFF_BASE", 0.2)
+    self.backoff_max = _env_float("NAVER_HTTP_BACKOFF_MAX", 5.0)
+    self.retry_deadline = _env_float("NAVER_HTTP_RETRY_DEADLINE", 15.0)
+
+    # 동일한 업스트림 요청이 동시에 들어오면 하나의 요청 결과를 공유 (NAVER_HTTP_COALESCE=0 으로 비활성화)
+    self._singleflight = SingleFlight() if os.getenv("NAVER_HTTP_COALESCE", "1") != "0" else None
+
+    self.metrics = {
+      "requests": 0,
+      "retries": 0,
+      "rate_limited_responses": 0,
+      "failures": 0,
+    }
+
+  @staticmethod
+  def _token_bucket(qps_env: str, burst_env: str) -> Optional[TokenBucket]:
+    qps = _env_float(qps_env, 0.0)
+    if qps <= 0:
+      return None
+    return TokenBucket(qps, _env_int(burst_env, max(1, int(qps))))
+
+  def stats(self) -> Dict:
+    limiters = [limiter for limiter in self._rate_limiters.values() if limiter is not None]
+    return {
+      **self.metrics,
+      "throttled_waits": sum(limiter.throttled_waits for limiter in limiters),
+      "throttled_seconds": round(sum(limiter.throttled_seconds for limiter in limiters), 3),
+      "coalesced_calls": self._singleflight.coalesced if self._singleflight else 0,
+    }
+
+  async def __aenter__(self) -> "NaverMapsClient":
+    return self
+
+  async def __aexit__(self, *exc_info) -> None:
+    await self.aclose()
+
+  async def aclose(self) -> None:
+    """
+    풀에 있는 모든 연결을 닫음. 클라이언트는 계속 사용할 수 있으며, 다음 호출 시 풀을 다시 생성
+    """
+    clients, self._clients = self._clients, {}
+    for client in clients.values():
+      await client.aclose()
+
   async def geocode(
     self,
     query: str,
@@ -41,40 +137,121 @@ class NaverMapsClient:
     """
     https://api.ncloud-docs.com/docs/application-maps-geocoding
     """
-    path = f"{self.MAP_BASE_URL}/map-geocode/v2/geocode"
+    path = "/map-geocode/v2/geocode"
     params = {
       "query": query,
       "language": language,
       "page": page,
       "count": count,
     }
-    response_json = await self._get(path, self.naver_maps_headers, params)
-    return GeocodeResponse(**response_json)
+    body = await self._get(self.map_base_url, path, self.naver_maps_headers, params)
+    return GeocodeResponse.model_validate_json(body)
 
   async def searchForLocalInformation(
     self, query: str, display: int = 5, sort: Literal["random", "comment"] = "random", start: int = 1
-  ) -> LocalSearchResponse:
+  ) -> PlacePage:
     """
     https://developers.naver.com/docs/serviceapi/search/local/local.md#%EC%A7%80%EC%97%AD
     """
-    path = f"{self.SEARCH_BASE_URL}/local.json"
+    path = "/local.json"
     params = {
       "query": query,
       "display": display,
       "sort": sort,
       "start": start
     }
-    response_json = await self._get(path, self.naver_headers, params)
-    return LocalSearchResponse(**response_json)
+    body = await self._get(self.search_base_url, path, self.naver_headers, params)
+    try:
+      return PlacePage.from_response(json.loads(body))
+    except (KeyError, TypeError, ValueError) as exc:
+      raise NaverMapsClientError(f"Unexpected local search response: {exc!r}") from exc
+
+  def _client(self, base_url: str, headers: Dict) -> httpx.AsyncClient:
+    client = self._clients.get(base_url)
+    if client is None or client.is_closed:
+      client = httpx.AsyncClient(
+        base_url=base_url,
+        headers=headers,
+        http2=True,
+        limits=self.limits,
+        timeout=self.timeout,
+      )
+      self._clients[base_url] = client
+    return client
 
-  async def _get(self, path: str, headers: Dict, params: Dict) -> Dict:
-    async with httpx.AsyncClient(headers=headers, http2=True) as client:
-      response = await client.get(path, params=params)
+  async def _get(self, base_url: str, path: str, headers: Dict, params: Dict) -> bytes:
+    """
+    응답 본문(bytes)을 반환. 파싱은 호출 측에서 엔드포인트에 맞는 방식으로 한 번만 수행
+    같은 엔드포인트/파라미터의 요청이 진행 중이면 새로 보내지 않고 그 결과를 함께 사용
+    """
+    if self._singleflight is None:
+      return await self._fetch(base_url, path, headers, params)
+    return await self._singleflight.do(
+      self._request_key(base_url, path, params),
+      lambda: self._fetch(base_url, path, headers, params),
+    )
+
+  @staticmethod
+  def _request_key(base_url: str, path: str, params: Dict) -> Tuple:
+    """
+    병합 키: 엔드포인트 + 정규화된 파라미터 (공백 정리, 대소문자 무시, 순서 무관)
+    """
+    normalized = tuple(sorted(
+      (name, " ".join(str(value).lower().split())) for name, value in params.items()
+    ))
+    return base_url, path, normalized
 
+  async def _fetch(self, base_url: str, path: str, headers: Dict, params: Dict) -> bytes:
+    deadline = time.monotonic() + self.retry_deadline
+    attempt = 0
+
+    while True:
+      rate_limiter = self._rate_limiters.get(base_url)
+      if rate_limiter is not None:
+        await rate_limiter.acquire()
+
+      self.metrics["requests"] += 1
       try:
-        return response.raise_for_status().json()
-      except httpx.HTTPError as exc:
-        self._handle_response_status(response.status_code, exc)
+        response = await self._client(base_url, headers).get(path, params=params)
+      except httpx.TransportError:
+        delay = self._retry_delay(attempt, deadline)
+        if delay is None:
+          self.metrics["failures"] += 1
+          raise
+      else:
+        delay = None
+        if response.status_code in RETRYABLE_STATUS_CODES:
+          self.metrics["rate_limited_responses"] += 1
+        if response.status_code in RETRYABLE_STATUS_CODES or response.status_code >= 500:
+          delay = self._retry_delay(attempt, deadline, response.headers.get("Retry-After"))
+
+        if delay is None:
+          try:
+            return response.raise_for_status().content
+          except httpx.HTTPError as exc:
+            self.metrics["failures"] += 1
+            self._handle_response_status(response.status_code, exc)
+
+      self.metrics["retries"] += 1
+      attempt += 1
+      await asyncio.sleep(delay)
+
+  def _retry_delay(
+    self, attempt: int, deadline: float, retry_after: Optional[str] = None
+  ) -> Optional[float]:
+    """
+    지터가 적용된 지수 백오프 대기 시간. 재시도 횟수나 전체 마감 시간을 넘으면 None
+    """
+    if attempt >= self.max_retries:
+      return None
+
+    delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+    if retry_after and retry_after.isdigit():
+      delay = max(delay, float(retry_after))
+
+    if time.monotonic() + delay > deadline:
+      return None
+    return delay
 
   def _handle_response_status(self, http_status_code: int, http_error: httpx.HTTPError):
     error_str = str(http_error)
@@ -82,7 +259,7 @@ class NaverMapsClient:
       raise BadRequestError(error_str)
     if http_status_code == 401:
       raise AuthError(error_str)
-    if http_status_code == 420:
+    if http_status_code in RETRYABLE_STATUS_CODES:
       raise RateLimitError(error_str)
     if http_status_code != 200:
       raise NaverMapsClientError(
@@ -0,0 +1,171 @@
+import html
+import re
+
+from array import array
+from dataclasses import dataclass
+from naver_map_mcp.models import LocalItem, LocalSearchResponse
+from typing import Dict, List, Literal, Optional, Sequence
+
+COORDINATE_SCALE = 10_000_000  # 네이버 검색 API 좌표 배율 (mapx/mapy = 경위도 × 10,000,000)
+TAG_PATTERN = re.compile(r"<[^>]+>")
+
+# 도구 응답에서 선택 가능한 필드 (latitude/longitude는 변환된 좌표, distance_m은 중심점으로부터의 거리)
+PlaceField = Literal[
+  "title", "link", "category", "description", "address", "roadAddress", "mapx", "mapy",
+  "latitude", "longitude",
+]
+DistancePlaceField = Literal[
+  "title", "link", "category", "description", "address", "roadAddress", "mapx", "mapy",
+  "latitude", "longitude", "distance_m",
+]
+ResponseFormat = Literal["full", "compact"]
+
+# compact 형식의 기본 열 (링크/설명/지번 주소/배율 좌표 제외)
+COMPACT_FIELDS = ("title", "category", "roadAddress", "latitude", "longitude")
+
+
+@dataclass(slots=True)
+class Place:
+  """
+  내부 처리용 장소 표현
+  - 좌표는 생성 시 한 번만 실수(lon/lat)로 변환
+  - title의 강조 태그(<b>)와 HTML 엔티티는 미리 제거
+  - pydantic 모델(LocalItem)은 MCP 응답을 만들 때만 생성
+  """
+
+  title: str
+  link: str
+  category: str
+  description: str
+  address: str
+  roadAddress: str
+  mapx: str
+  mapy: str
+  lon: float
+  lat: float
+
+  @classmethod
+  def from_item(cls, item: Dict) -> "Place":
+    """
+    검색 API 응답 항목(또는 같은 형식의 저장 데이터)으로부터 생성 (업스트림 응답을 신뢰하여 검증 생략)
+    """
+    mapx = str(item["mapx"])
+    mapy = str(item["mapy"])
+    return cls(
+      html.unescape(TAG_PATTERN.sub("", item["title"])),
+      item.get("link", ""),
+      item.get("category", ""),
+      item.get("description", ""),
+      item.get("address", ""),
+      item.get("roadAddress", ""),
+      mapx,
+      mapy,
+      float(mapx) / COORDINATE_SCALE,
+      float(mapy) / COORDINATE_SCALE,
+    )
+
+  @property
+  def key(self) -> str:
+    return f"{self.title}|{self.mapx}|{self.mapy}"
+
+  def to_item(self) -> Dict:
+    return {
+      "title": self.title,
+      "link": self.link,
+      "category": self.category,
+      "description": self.description,
+      "address": self.address,
+      "roadAddress": self.roadAddress,
+      "mapx": self.mapx,
+      "mapy": self.mapy,
+    }
+
+  def to_model(self) -> LocalItem:
+    return LocalItem.model_construct(**self.to_item())
+
+  def values(self, fields: Sequence[str], distance: Optional[float] = None) -> List:
+    """
+    요청한 필드의 값을 순서대로 반환 (좌표는 소수점 7자리, 거리는 미터 단위 정수)
+    """
+    values = []
+    for field in fields:
+      if field == "latitude":
+        values.append(round(self.lat, 7))
+      elif field == "longitude":
+        values.append(round(self.lon, 7))
+      elif field == "distance_m":
+        values.append(None if distance is None else round(distance))
+      else:
+        values.append(getattr(self, field))
+    return values
+
+
+@dataclass(slots=True)
+class PlacePage:
+  """
+  검색 결과 한 페이지. 좌표는 배열(lons/lats)로도 보관하여 거리 계산 시 그대로 사용
+  """
+
+  total: int
+  start: int
+  display: int
+  items: List[Place]
+  lons: array
+  lats: array
+
+  @classmethod
+  def from_response(cls, response: Dict) -> "PlacePage":
+    items = [Place.from_item(item) for item in response.get("items", [])]
+    return cls(
+      int(response["total"]),
+      int(response["start"]),
+      int(response["display"]),
+      items,
+      array("d", (place.lon for place in items)),
+      array("d", (place.lat for place in items)),
+    )
+
+  def to_model(self) -> LocalSearchResponse:
+    return to_response(self.items, self.total, self.start)
+
+
+def to_response(places: List[Place], total: int, start: int = 1) -> LocalSearchResponse:
+  """
+  MCP 응답 경계에서 pydantic 모델로 변환 (이미 검증된 값이므로 model_construct 사용)
+  """
+  return LocalSearchResponse.model_construct(
+    total=total,
+    start=start,
+    display=len(places),
+    items=[place.to_model() for place in places],
+  )
+
+
+def render_places(
+  places: List[Place],
+  total: int,
+  start: int = 1,
+  fields: Optional[Sequence[str]] = None,
+  response_format: ResponseFormat = "full",
+  distances: Optional[List[float]] = None,
+) -> LocalSearchResponse | Dict:
+  """
+  도구 응답 생성
+  - full + fields 없음: 기존과 같은 LocalSearchResponse
+  - full + fields: 요청한 필드만 담은 항목 목록
+  - compact: 열 이름(columns)과 행 배열(rows)로 구성된 표 형식 (기본 열: COMPACT_FIELDS [+ distance_m])
+  """
+  if response_format == "full" and not fields:
+    return to_response(places, total, start)
+
+  if not fields:
+    fields = COMPACT_FIELDS + (("distance_m",) if distances is not None else ())
+  fields = list(dict.fromkeys(fields))
+  if distances is None:
+    distances = [None] * len(places)
+  rows = [place.values(fields, distance) for place, distance in zip(places, distances)]
+
+  result = {"total": total, "start": start, "display": len(places)}
+  if response_format == "compact":
+    return {**result, "columns": fields, "rows": rows}
+  return {**result, "items": [dict(zip(fields, row)) for row in rows]}
@@ -0,0 +1,230 @@
+import json
+import math
+import sqlite3
+import time
+
+from naver_map_mcp.geo import bounding_box, calculate_distance, within_radius
+from naver_map_mcp.places import Place
+from naver_map_mcp.sqlite_worker import SqliteWorker
+from typing import Dict, List, Optional, Tuple
+
+
+class PoiIndex:
+  """
+  지금까지 조회한 모든 장소(POI)를 검색어별로 보관하는 SQLite 기반 격자(grid) 공간 인덱스
+  - 장소는 mapx/mapy에서 얻은 좌표로 격자 셀에 배치되어 반경 조회 시 후보 셀만 탐색
+  - 검색 이력(coverage)을 함께 저장하여 요청 반경이 최근 검색 반경에 포함되면 API 없이 응답
+  - DB 작업은 전용 스레드(SqliteWorker)에서 실행: 저장(add_items/add_coverage)은 기다리지 않는 백그라운드 쓰기,
+    조회는 alookup/astats로 비동기 대기. 같은 스레드에서 순서대로 실행되므로 조회는 앞선 저장 결과를 봄
+  - TTL이 지난 항목은 시작 시와 prune_interval초마다 한 번 정리 (조회는 TTL 이내 항목만 사용)
+  """
+
+  CELL_DEGREES = 0.005  # 약 500m 크기의 격자 셀
+
+  def __init__(self, path: str, ttl_seconds: float = 7 * 24 * 3600, prune_interval: float = 3600):
+    self.path = path
+    self.ttl_seconds = ttl_seconds
+    self.prune_interval = prune_interval
+    self.hits = 0
+    self.misses = 0
+    self.errors = 0
+    self._last_prune = 0.0
+
+    self._worker = SqliteWorker(path)
+    self._conn = self._worker.conn
+    self._worker.call(self._setup)
+
+  def _setup(self) -> None:
+    self._conn.execute(
+      """
+      CREATE TABLE IF NOT EXISTS pois (
+        query_key TEXT NOT NULL,
+        poi_key TEXT NOT NULL,
+        rank INTEGER NOT NULL,
+        cell_x INTEGER NOT NULL,
+        cell_y INTEGER NOT NULL,
+        lon REAL NOT NULL,
+        lat REAL NOT NULL,
+        category TEXT NOT NULL,
+        payload TEXT NOT NULL,
+        seen_at REAL NOT NULL,
+        PRIMARY KEY (query_key, poi_key)
+      )
+      """
+    )
+    self._conn.execute(
+      "CREATE INDEX IF NOT EXISTS pois_cell ON pois (query_key, cell_x, cell_y)"
+    )
+    self._conn.execute(
+      """
+      CREATE TABLE IF NOT EXISTS coverage (
+        query_key TEXT NOT NULL,
+        lon REAL NOT NULL,
+        lat REAL NOT NULL,
+        radius REAL NOT NULL,
+        exhausted INTEGER NOT NULL,
+        searched_at REAL NOT NULL
+      )
+      """
+    )
+    self._conn.execute("CREATE INDEX IF NOT EXISTS coverage_query ON coverage (query_key)")
+    self._conn.commit()
+    self.prune()
+
+  @staticmethod
+  def make_query_key(query: str, sort: str) -> str:
+    return f"{sort}|{' '.join(query.lower().split())}"
+
+  def _cell(self, lon: float, lat: float) -> tuple:
+    return math.floor(lon / self.CELL_DEGREES), math.floor(lat / self.CELL_DEGREES)
+
+  def add_items(self, query_key: str, start: int, items: List[Place]) -> None:
+    """
+    검색 결과 페이지의 모든 장소를 백그라운드로 저장 (반경 밖의 장소 포함)
+    rank는 업스트림 검색 결과의 절대 위치(start 기준)이므로 display와 무관하며, 인덱스 응답도 이 순서를 따름
+    """
+    self._worker.submit(self._write_items, query_key, start, list(items), time.time())
+
+  def _write_items(self, query_key: str, start: int, items: List[Place], now: float) -> None:
+    rows = []
+    for position, place in enumerate(items):
+      cell_x, cell_y = self._cell(place.lon, place.lat)
+      rows.append((
+        query_key,
+        place.key,
+        start - 1 + position,
+        cell_x,
+        cell_y,
+        place.lon,
+        place.lat,
+        place.category,
+        json.dumps(place.to_item(), ensure_ascii=False),
+        now,
+      ))
+
+    self._conn.executemany(
+      "INSERT INTO pois "
+      "(query_key, poi_key, rank, cell_x, cell_y, lon, lat, category, payload, seen_at) "
+      "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+      "ON CONFLICT (query_key, poi_key) DO UPDATE SET "
+      "rank = MIN(rank, excluded.rank), payload = excluded.payload, seen_at = excluded.seen_at",
+      rows,
+    )
+    self._conn.commit()
+
+  def add_coverage(
+    self, query_key: str, lon: float, lat: float, radius: float, exhausted: bool
+  ) -> None:
+    """
+    검색어/중심/반경에 대한 검색 이력을 백그라운드로 저장. exhausted는 검색 결과를 끝까지 확인했음을 의미
+    """
+    self._worker.submit(self._write_coverage, query_key, lon, lat, radius, exhausted, time.time())
+
+  def _write_coverage(
+    self, query_key: str, lon: float, lat: float, radius: float, exhausted: bool, now: float
+  ) -> None:
+    self._conn.execute(
+      "INSERT INTO coverage (query_key, lon, lat, radius, exhausted, searched_at) "
+      "VALUES (?, ?, ?, ?, ?, ?)",
+      (query_key, lon, lat, radius, int(exhausted), now),
+    )
+    self._conn.commit()
+    if now - self._last_prune >= self.prune_interval:
+      self.prune()
+
+  def prune(self) -> None:
+    """
+    TTL이 지난 장소와 검색 이력 삭제 (전용 스레드에서 실행)
+    """
+    now = time.time()
+    cutoff = now - self.ttl_seconds
+    self._conn.execute("DELETE FROM coverage WHERE searched_at < ?", (cutoff,))
+    self._conn.execute("DELETE FROM pois WHERE seen_at < ?", (cutoff,))
+    self._conn.commit()
+    self._last_prune = now
+
+  def query_radius(
+    self, query_key: str, lon: float, lat: float, radius: float
+  ) -> List[Tuple[Place, float]]:
+    """
+    반경 내에 있는 최신 장소를 검색 결과 순서대로 (장소, 거리) 목록으로 반환
+    """
+    min_lon, min_lat, max_lon, max_lat = bounding_box(lon, lat, radius)
+    min_x, min_y = self._cell(min_lon, min_lat)
+    max_x, max_y = self._cell(max_lon, max_lat)
+
+    rows = self._conn.execute(
+      "SELECT lon, lat, payload FROM pois "
+      "WHERE query_key = ? AND cell_x BETWEEN ? AND ? AND cell_y BETWEEN ? AND ? "
+      "AND seen_at >= ? ORDER BY rank",
+      (query_key, min_x, max_x, min_y, max_y, time.time() - self.ttl_seconds),
+    ).fetchall()
+
+    indices, distances = within_radius(
+      lon, lat, [row[0] for row in rows], [row[1] for row in rows], radius
+    )
+    return [
+      (Place.from_item(json.loads(rows[index][2])), float(distance))
+      for index, distance in zip(indices, distances)
+    ]
+
+  def lookup(
+    self, query_key: str, lon: float, lat: float, radius: float, min_results: int
+  ) -> Optional[List[Tuple[Place, float]]]:
+    """
+    요청 반경을 포함하는 최근 검색 이력이 있으면 인덱스에서 결과를 반환하고, 없으면 None
+    - 인덱스의 반경 내 장소가 min_results 이상이거나
+    - 포함하는 검색이 결과를 끝까지 확인했다면(exhausted) 인덱스 결과로 충분
+    """
+    rows = self._conn.execute(
+      "SELECT lon, lat, radius, exhausted FROM coverage WHERE query_key = ? AND searched_at >= ?",
+      (query_key, time.time() - self.ttl_seconds),
+    ).fetchall()
+    covering = [
+      exhausted
+      for covered_lon, covered_lat, covered_radius, exhausted in rows
+      if calculate_distance(lon, lat, covered_lon, covered_lat) + radius <= covered_radius
+    ]
+    if not covering:
+      self.misses += 1
+      return None
+
+    matches = self.query_radius(query_key, lon, lat, radius)
+    if len(matches) >= min_results or any(covering):
+      self.hits += 1
+      return matches
+
+    self.misses += 1
+    return None
+
+  async def alookup(
+    self, query_key: str, lon: float, lat: float, radius: float, min_results: int
+  ) -> Optional[List[Tuple[Place, float]]]:
+    """
+    lookup을 전용 스레드에서 실행. 다른 프로세스의 잠금 등으로 실패하면 인덱스 미스로 처리
+    """
+    try:
+      return await self._worker.run(self.lookup, query_key, lon, lat, radius, min_results)
+    except sqlite3.Error:
+      self.errors += 1
+      self.misses += 1
+      return None
+
+  def close(self) -> None:
+    self._worker.close()
+
+  def stats(self) -> Dict:
+    (pois,) = self._conn.execute("SELECT COUNT(*) FROM pois").fetchone()
+    (coverage,) = self._conn.execute("SELECT COUNT(*) FROM coverage").fetchone()
+    lookups = self.hits + self.misses
+    return {
+      "pois": pois,
+      "coverage_records": coverage,
+      "hits": self.hits,
+      "misses": self.misses,
+      "errors": self.errors,
+      "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+    }
+
+  async def astats(self) -> Dict:
+    return await self._worker.run(self.stats)
@@ -0,0 +1,39 @@
+import asyncio
+import time
+
+
+class TokenBucket:
+  """
+  초당 rate개의 토큰이 채워지고 최대 burst개까지 쌓이는 토큰 버킷
+  토큰이 없으면 다음 토큰이 채워질 때까지 대기하며, 대기자는 도착 순서대로 처리
+  """
+
+  def __init__(self, rate: float, burst: int):
+    self.rate = rate
+    self.capacity = max(1, burst)
+    self.throttled_waits = 0
+    self.throttled_seconds = 0.0
+    self._tokens = float(self.capacity)
+    self._updated = time.monotonic()
+    self._lock = asyncio.Lock()
+
+  def _refill(self) -> None:
+    now = time.monotonic()
+    self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+    self._updated = now
+
+  async def acquire(self) -> float:
+    """
+    토큰 하나를 소비하고, 토큰을 기다린 시간(초)을 반환
+    """
+    async with self._lock:
+      self._refill()
+      wait = 0.0
+      if self._tokens < 1:
+        wait = (1 - self._tokens) / self.rate
+        self.throttled_waits += 1
+        self.throttled_seconds += wait
+        await asyncio.sleep(wait)
+        self._refill()
+      self._tokens -= 1
+      return wait
@@ -1,37 +1,85 @@
 from mcp.server.fastmcp import FastMCP
+from naver_map_mcp.geocode_cache import address_aliases
 from naver_map_mcp.naver_maps_client import NaverMapsClient
-from naver_map_mcp.models import GeocodeResponse, LocalSearchResponse, LocalItem
-from dotenv import load_dotenv
+from naver_map_mcp.models import GeocodeResponse, LocalSearchResponse
+from naver_map_mcp.places import (
+  DistancePlaceField, Place, PlaceField, ResponseFormat, render_places,
+)
 from pydantic import Field
-from typing import Dict, Literal, List
+from starlette.applications import Starlette
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Literal, List, Optional, Tuple
+from contextlib import asynccontextmanager
+import asyncio
 import math
 import logging
 import os
-import json
-from datetime import datetime
+import time
 
-load_dotenv()
+# .env 로드, 로그 파일, API 클라이언트, 캐시/인덱스 생성은 첫 도구 호출 시점(initialize)으로 미룸
+# 에이전트가 서버를 필요할 때마다 띄우므로 import 및 MCP initialize 응답을 최대한 빠르게 유지
+logger = logging.getLogger('naver_map_mcp')
+naver_maps_client: Optional[NaverMapsClient] = None
+geocode_cache = None
+poi_index = None
+_initialized = False
 
-# 로깅 설정
-log_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../../logs')
-os.makedirs(log_dir, exist_ok=True)
 
-logger = logging.getLogger('naver_map_mcp')
-logger.setLevel(logging.INFO)
+def _data_path(*parts: str) -> str:
+  return os.path.join(os.path.dirname(os.path.abspath(__file__)), '../..', *parts)
+
+
+def initialize() -> None:
+  """
+  서버 자원을 최초 1회 초기화 (이미 초기화되었으면 아무것도 하지 않음)
+  자격 증명이 없으면 AuthError가 발생하며, 다음 도구 호출 시 다시 시도
+  """
+  global naver_maps_client, geocode_cache, poi_index, _initialized
+  if _initialized:
+    return
+
+  from dotenv import load_dotenv
+  load_dotenv()
+
+  # 로깅 설정 (큐 기반 JSON Lines 로거, 크기 기준 파일 교체)
+  if not logger.handlers:
+    from naver_map_mcp.log_pipeline import setup_logging
+
+    # 워커 프로세스가 여럿이면 각자 파일을 교체하므로 워커(pid)마다 별도 파일에 기록
+    log_name = 'coordinate_search.jsonl'
+    if int(os.getenv("NAVER_MCP_WORKERS", 1)) > 1:
+      log_name = f'coordinate_search.{os.getpid()}.jsonl'
+    setup_logging(
+      'naver_map_mcp',
+      os.path.join(os.getenv("NAVER_LOG_DIR", _data_path('logs')), log_name),
+      level=os.getenv("NAVER_LOG_LEVEL", "INFO").upper(),
+      sample_rate=float(os.getenv("NAVER_LOG_SAMPLE_RATE", 1.0)),
+      max_bytes=int(os.getenv("NAVER_LOG_MAX_BYTES", 10 * 1024 * 1024)),
+      backup_count=int(os.getenv("NAVER_LOG_BACKUP_COUNT", 5)),
+    )
 
-# 파일 핸들러 설정
-log_file = os.path.join(log_dir, f'coordinate_search_{datetime.now().strftime("%Y%m%d")}.log')
-file_handler = logging.FileHandler(log_file)
-file_handler.setLevel(logging.INFO)
+  if naver_maps_client is None:
+    naver_maps_client = NaverMapsClient()
 
-# 포맷 설정
-formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-file_handler.setFormatter(formatter)
+  # 지오코딩 캐시 설정 (NAVER_GEOCODE_CACHE=0 으로 비활성화)
+  if os.getenv("NAVER_GEOCODE_CACHE", "1") != "0":
+    from naver_map_mcp.geocode_cache import GeocodeCache
 
-# 로거에 핸들러 추가
-logger.addHandler(file_handler)
+    geocode_cache = GeocodeCache(
+      os.getenv("NAVER_GEOCODE_CACHE_PATH", _data_path('cache', 'geocode.sqlite3')),
+      ttl_seconds=float(os.getenv("NAVER_GEOCODE_CACHE_TTL", 30 * 24 * 3600)),
+      max_entries=int(os.getenv("NAVER_GEOCODE_CACHE_MAX_ENTRIES", 50_000)),
+    )
+
+  # 장소(POI) 공간 인덱스 설정 (NAVER_POI_INDEX=0 으로 비활성화)
+  if os.getenv("NAVER_POI_INDEX", "1") != "0":
+    from naver_map_mcp.poi_index import PoiIndex
 
-naver_maps_client = NaverMapsClient()
+    poi_index = PoiIndex(
+      os.getenv("NAVER_POI_INDEX_PATH", _data_path('cache', 'poi_index.sqlite3')),
+      ttl_seconds=float(os.getenv("NAVER_POI_INDEX_TTL", 7 * 24 * 3600)),
+    )
+
+  _initialized = True
 
 INSTRUCTIONS = """
 Naver Maps MCP provides location-based search capabilities using Naver Maps and Search APIs.
@@ -40,28 +88,102 @@ Naver Maps MCP provides location-based search capabilities using Naver Maps and
 - geocode: Convert addresses to coordinates with detailed address information
 - localSearch: Search for places using Naver's local database with pagination support
 - localSearchByCoordinate: Find places within a specific radius from coordinates (custom implementation with distance filtering)
+- geocodeBatch: Geocode many addresses in one call (results in input order)
+- localSearchBatch: Run many local searches in one call (results in input order)
+- amenitySweep: Survey several amenity categories (subway, bus stop, mart, hospital, school, ...) around one coordinate in one call
+- serverStats: Report cache hit/miss counters and other server statistics
 </tools>
 
 <rules>
 - All responses include metadata for pagination. Use 'start' parameter for localSearch pagination.
 - For geocode, use 'page' parameter for pagination (default: page=1, count=10).
+- geocode results are cached on disk by normalized address. Set bypass_cache=true only when a fresh lookup is required.
 - localSearchByCoordinate performs automatic multi-page searching and distance filtering to meet min_results requirement.
+- localSearchByCoordinate answers from a local POI index when the same query was recently searched over an enclosing area. Set bypass_index=true only when fresh upstream results are required.
 - Coordinate format: Naver uses scaled coordinates (multiply by 10,000,000). This is handled automatically.
-- Rate limiting: Wait 0-50ms between consecutive calls with exponential backoff.
+- Rate limiting: The server throttles upstream calls and retries throttled (420) or failed (5xx) requests with backoff. Do not add delays between calls.
 - For location searches, prefer localSearchByCoordinate when radius-based filtering is needed.
+- For neighbourhood/location scoring, call amenitySweep once per location instead of one localSearchByCoordinate call per category.
+- When several addresses or queries are known up front, prefer geocodeBatch / localSearchBatch over repeated single calls.
+- To save context, pass fields (e.g., ["title", "distance_m"]) or response_format="compact" to localSearch / localSearchByCoordinate when only a few attributes are needed.
 - Query optimization: Include regional information (e.g., "강남역 근처 카페") for better localSearchByCoordinate results.
 </rules>
 """.strip()
 
+
 mcp = FastMCP("naver_map_mcp", instructions=INSTRUCTIONS)
 
 
+async def aclose_pools() -> None:
+  """
+  업스트림 커넥션 풀을 정리 (프로세스 종료 시 한 번만 호출)
+  """
+  if naver_maps_client is not None:
+    await naver_maps_client.aclose()
+
+
+async def run_async(transport: Literal["stdio", "sse"]) -> None:
+  """
+  stdio/SSE 전송으로 서버 실행
+  SSE는 연결(세션)마다 lifespan이 실행되므로, 공유 커넥션 풀은 세션이 아닌 서버 종료 시점에 정리
+  """
+  try:
+    if transport == "sse":
+      await mcp.run_sse_async()
+    else:
+      await mcp.run_stdio_async()
+  finally:
+    await aclose_pools()
+
+
+def create_http_app() -> Starlette:
+  """
+  여러 에이전트가 공유하는 장기 실행 서비스용 Streamable HTTP 앱 생성
+  워커 프로세스 간 세션 공유가 불가능하므로 stateless 모드로 동작하며,
+  커넥션 풀과 캐시는 워커 프로세스 단위로 유지
+  """
+  mcp.settings.stateless_http = True
+
+  app = mcp.streamable_http_app()
+  session_manager_lifespan = app.router.lifespan_context
+
+  @asynccontextmanager
+  async def app_lifespan(app: Starlette) -> AsyncIterator[None]:
+    # 장기 실행 서비스는 기동 시점에 초기화하여 설정 오류를 바로 드러냄
+    initialize()
+    async with session_manager_lifespan(app):
+      try:
+        yield
+      finally:
+        await aclose_pools()
+
+  app.router.lifespan_context = app_lifespan
+  return app
+
+
+MAX_SEARCH_PAGES = 10  # 최대 10페이지까지만 검색
+DEFAULT_BATCH_CONCURRENCY = 8  # 배치 도구의 기본 동시 요청 수 (NAVER_BATCH_CONCURRENCY로 변경)
+MAX_BATCH_SIZE = 100
+
+# amenitySweep 기본 조사 항목 (검색어 → 반경 m), 입지 분석 에이전트의 조사 기준과 동일
+DEFAULT_AMENITIES = {
+  "지하철역": 500,
+  "버스정류장": 1000,
+  "대형마트": 500,
+  "편의점": 500,
+  "병원": 1000,
+  "학교": 1000,
+}
+MAX_AMENITIES = 20
+
+
 @mcp.tool(description="Convert addresses to coordinates and get detailed address information with pagination support.")
 async def geocode(
   address: str = Field(description="Address to search for (Korean or English)", min_length=1),
   language: Literal["kor", "eng"] = Field("kor", description="Response language (kor: Korean, eng: English)"),
   page: int = Field(1, description="Page number for pagination (default: 1)", ge=1),
   count: int = Field(10, description="Number of results per page (default: 10, max: 100)", ge=1, le=100),
+  bypass_cache: bool = Field(False, description="Skip the local geocode cache and query Naver directly"),
 ) -> GeocodeResponse | Dict:
   """
   Converts addresses to coordinates using Naver Maps Geocoding API.
@@ -71,7 +193,8 @@ async def geocode(
     Each address includes: roadAddress, jibunAddress, englishAddress, x (longitude), y (latitude), distance
   """
   try:
-    return await naver_maps_client.geocode(address, language, page, count)
+    initialize()
+    return await cached_geocode(address, language, page, count, bypass_cache)
   except Exception as ex:
     return {"success": False, "error": str(ex)}
 
@@ -85,6 +208,17 @@ async def localSearch(
     description="Sort method - random: by relevance, comment: by review count (descending)",
   ),
   start: int = Field(1, description="Starting position for pagination (default: 1)", ge=1),
+  fields: Optional[List[PlaceField]] = Field(
+    None,
+    description="Return only these item fields (latitude/longitude are decoded decimal degrees)",
+  ),
+  response_format: ResponseFormat = Field(
+    "full",
+    description=(
+      "full: items as objects, compact: table of 'columns' and 'rows' "
+      "(default columns: title, category, roadAddress, latitude, longitude)"
+    ),
+  ),
 ) -> LocalSearchResponse | Dict:
   """
   Search for local places using Naver Search API.
@@ -93,9 +227,12 @@ async def localSearch(
     LocalSearchResponse: Contains total, start, display, and items list
     Each item includes: title, link, category, description, address, roadAddress, mapx, mapy
     Coordinates (mapx, mapy) are in Naver's scaled format (divide by 10,000,000 for actual coordinates)
+    With fields and/or response_format=compact, items are projected to the requested fields
   """
   try:
-    return await naver_maps_client.searchForLocalInformation(query, display, sort, start)
+    initialize()
+    page = await naver_maps_client.searchForLocalInformation(query, display, sort, start)
+    return render_places(page.items, page.total, page.start, fields, response_format)
   except Exception as ex:
     return {"success": False, "error": str(ex)}
 
@@ -112,122 +249,466 @@ async def localSearchByCoordinate(
     description="Sort method - random: by relevance, comment: by review count",
   ),
   min_results: int = Field(1, description="Minimum results to find before stopping search (default: 1)", ge=1, le=5),
+  prefetch: int = Field(
+    1,
+    description="Number of result pages requested concurrently ahead of filtering (default 1 = sequential, opt-in speculative paging)",
+    ge=1,
+    le=MAX_SEARCH_PAGES,
+  ),
+  bypass_index: bool = Field(False, description="Skip the local POI index and query Naver directly"),
+  sort_by_distance: bool = Field(False, description="Order results by distance from the center instead of search order"),
+  fields: Optional[List[DistancePlaceField]] = Field(
+    None,
+    description=(
+      "Return only these item fields (latitude/longitude are decoded decimal degrees, "
+      "distance_m is the distance from the center)"
+    ),
+  ),
+  response_format: ResponseFormat = Field(
+    "full",
+    description=(
+      "full: items as objects, compact: table of 'columns' and 'rows' "
+      "(default columns: title, category, roadAddress, latitude, longitude, distance_m)"
+    ),
+  ),
 ) -> LocalSearchResponse | Dict:
   """
   Search for places within a specific radius from coordinates.
   
   This function:
-  1. Performs multiple localSearch calls across pages
+  1. Performs multiple localSearch calls across pages, one at a time by default or, with
+     `prefetch` > 1, requesting up to `prefetch` pages concurrently
   2. Filters results by calculating actual distance using Haversine formula
-  3. Continues searching until min_results found or max 10 pages searched
+  3. Continues searching until min_results found or max 10 pages searched,
+     cancelling prefetched pages that are no longer needed
   4. Returns only places within the specified radius
   
+  A place that appears on more than one result page (Naver pages can overlap) is returned and
+  counted once, so total and search_stats.filtered_items can be lower than the raw number of
+  in-radius items across pages.
+  
+  If the same query was recently searched around an area enclosing this radius, the result is
+  answered from the local POI index without calling Naver.
+  
   Returns:
     LocalSearchResponse: Filtered results within radius, with actual coordinates and distance calculations
     Includes search statistics in logs for debugging
+    With fields and/or response_format=compact, items are projected to the requested fields
   """
+  started_at = time.perf_counter()
+  input_params = {
+    "query": query,
+    "longitude": longitude,
+    "latitude": latitude,
+    "radius": radius,
+    "display": display,
+    "sort": sort,
+    "min_results": min_results,
+    "prefetch": prefetch,
+    "bypass_index": bypass_index,
+    "sort_by_distance": sort_by_distance,
+    "fields": fields,
+    "response_format": response_format,
+  }
   try:
-    # 입력 파라미터 로깅
-    input_params = {
-      "query": query,
-      "longitude": longitude,
-      "latitude": latitude,
-      "radius": radius,
-      "display": display,
-      "sort": sort,
-      "min_results": min_results
-    }
-    logger.info(f"localSearchByCoordinate - Input: {json.dumps(input_params, ensure_ascii=False)}")
-    
-    filtered_items = []
-    start = 1
-    max_attempts = 10  # 최대 10페이지까지만 검색
+    initialize()
     search_stats = {"pages_searched": 0, "total_items_found": 0, "filtered_items": 0}
+    matches = await indexed_search_within_radius(
+      query, longitude, latitude, radius, display, sort, min_results, prefetch, search_stats,
+      bypass_index,
+    )
+    if sort_by_distance:
+      matches.sort(key=lambda match: match[1])
+    filtered_items = [place for place, _ in matches]
     
-    while len(filtered_items) < min_results and start <= max_attempts:
-      # 검색 수행
-      response = await naver_maps_client.searchForLocalInformation(query, display, sort, start)
-      search_stats["pages_searched"] += 1
-      
-      # 중간 조회 결과 로깅
-      logger.info(f"localSearchByCoordinate - Page {start} results: total={response.total}, items={len(response.items)}")
-      if response.items:
-        items_dict = [item.dict() for item in response.items]
-        logger.info(f"localSearchByCoordinate - Page {start} items: {json.dumps(items_dict, ensure_ascii=False)}")
-      
-      if not response.items:
-        break
-      
-      search_stats["total_items_found"] += len(response.items)
-      
-      # 좌표 기반 필터링
-      for item in response.items:
-        if hasattr(item, 'mapx') and hasattr(item, 'mapy'):
-          item_lon = float(item.mapx) / 10_000_000
-          item_lat = float(item.mapy) / 10_000_000
-          
-          # 거리 계산 (Haversine 공식)
-          distance = calculate_distance(longitude, latitude, item_lon, item_lat)
-          
-          # 반경 내에 있는 항목만 추가
-          if distance <= radius:
-            filtered_items.append(item)
-            search_stats["filtered_items"] += 1
-      
-      # 다음 페이지로
-      start += 1
-      
-      # 충분한 결과를 찾았거나 더 이상 결과가 없으면 종료
-      if len(filtered_items) >= min_results or response.total <= (start-1) * display:
-        break
-    
-    # 결과 구성
-    result = LocalSearchResponse(
-      total=len(filtered_items),
-      start=1,
-      display=len(filtered_items),
-      items=filtered_items[:display]
+    # 결과 구성 (pydantic 모델은 응답 경계에서만 생성)
+    result = render_places(
+      filtered_items[:display],
+      len(filtered_items),
+      fields=fields,
+      response_format=response_format,
+      distances=[distance for _, distance in matches[:display]],
     )
     
-    # 출력 결과 로깅
-    output_summary = {
-      "total_results": len(filtered_items),
-      "displayed_results": min(len(filtered_items), display),
-      "search_stats": search_stats
-    }
-    logger.info(f"localSearchByCoordinate - Output: {json.dumps(output_summary, ensure_ascii=False)}")
+    # 입력/출력 요약을 하나의 레코드로 로깅 (직렬화는 백그라운드 스레드에서 수행)
+    logger.info("localSearchByCoordinate", extra={"data": {
+      "input": input_params,
+      "output": {
+        "total_results": len(filtered_items),
+        "displayed_results": min(len(filtered_items), display),
+        "search_stats": search_stats,
+      },
+      "elapsed_ms": round((time.perf_counter() - started_at) * 1000, 1),
+    }})
     
-    # 검색된 항목 로깅
-    if filtered_items:
-      filtered_items_dict = [item.dict() for item in filtered_items[:display]]
-      logger.info(f"localSearchByCoordinate - Found items: {json.dumps(filtered_items_dict, ensure_ascii=False)}")
+    # 검색된 항목 전체는 디버깅 시에만 로깅
+    if filtered_items and logger.isEnabledFor(logging.DEBUG):
+      logger.debug("localSearchByCoordinate - Found items", extra={"data": {
+        "input": input_params,
+        "items": filtered_items[:display],
+      }})
     
     return result
   except Exception as ex:
     error_msg = str(ex)
-    logger.error(f"localSearchByCoordinate - Error: {error_msg}")
+    logger.error("localSearchByCoordinate - Error", extra={"data": {
+      "input": input_params,
+      "error": error_msg,
+    }})
     return {"success": False, "error": error_msg}
 
 
-def calculate_distance(lon1: float, lat1: float, lon2: float, lat2: float) -> float:
-  """
-  두 지점 간의 거리를 미터 단위로 계산 (Haversine 공식)
+@mcp.tool(description="Geocode multiple addresses concurrently in a single call. Results are returned in input order.")
+async def geocodeBatch(
+  addresses: List[str] = Field(
+    description="Addresses to search for (Korean or English)", min_length=1, max_length=MAX_BATCH_SIZE
+  ),
+  language: Literal["kor", "eng"] = Field("kor", description="Response language (kor: Korean, eng: English)"),
+  count: int = Field(1, description="Number of results per address (default: 1, max: 100)", ge=1, le=100),
+  bypass_cache: bool = Field(False, description="Skip the local geocode cache and query Naver directly"),
+  concurrency: Optional[int] = Field(
+    None, description="Maximum number of concurrent upstream requests (default: 8)", ge=1, le=20
+  ),
+) -> Dict:
   """
-  R = 6371000  # 지구 반경 (미터)
+  Geocodes every address with bounded concurrency.
   
-  # 라디안으로 변환
-  lat1_rad = math.radians(lat1)
-  lon1_rad = math.radians(lon1)
-  lat2_rad = math.radians(lat2)
-  lon2_rad = math.radians(lon2)
-  
-  # 위도와 경도의 차이
-  dlat = lat2_rad - lat1_rad
-  dlon = lon2_rad - lon1_rad
+  Returns:
+    Dict: {"results": [...]} with one entry per input address, in input order
+    Each entry includes: address, success, and either result (GeocodeResponse) or error
+  """
+  try:
+    initialize()
+  except Exception as ex:
+    return {"success": False, "error": str(ex)}
+
+  results = await run_batch(
+    addresses,
+    lambda address: cached_geocode(address, language, 1, count, bypass_cache),
+    concurrency,
+  )
+  return {
+    "results": [{"address": address, **result} for address, result in zip(addresses, results)]
+  }
+
+
+@mcp.tool(description="Run multiple local searches concurrently in a single call. Results are returned in input order.")
+async def localSearchBatch(
+  queries: List[str] = Field(
+    description="Search queries (e.g., ['역삼역 지하철역', '역삼동 편의점'])", min_length=1, max_length=MAX_BATCH_SIZE
+  ),
+  display: int = Field(5, description="Number of results to display per query (max: 5)", ge=1, le=5),
+  sort: Literal["random", "comment"] = Field(
+    "random",
+    description="Sort method - random: by relevance, comment: by review count (descending)",
+  ),
+  concurrency: Optional[int] = Field(
+    None, description="Maximum number of concurrent upstream requests (default: 8)", ge=1, le=20
+  ),
+) -> Dict:
+  """
+  Searches every query with bounded concurrency.
   
-  # Haversine 공식
-  a = math.sin(dlat/2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon/2)**2
-  c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-  distance = R * c
+  Returns:
+    Dict: {"results": [...]} with one entry per input query, in input order
+    Each entry includes: query, success, and either result (LocalSearchResponse) or error
+  """
+  try:
+    initialize()
+  except Exception as ex:
+    return {"success": False, "error": str(ex)}
+
+  results = await run_batch(
+    queries,
+    lambda query: local_search_model(query, display, sort),
+    concurrency,
+  )
+  return {
+    "results": [{"query": query, **result} for query, result in zip(queries, results)]
+  }
+
+
+@mcp.tool(description="Survey several amenity categories around one coordinate in a single call (nearest distance, count and closest places per category).")
+async def amenitySweep(
+  longitude: float = Field(description="Center longitude in decimal degrees (e.g., 127.0366)"),
+  latitude: float = Field(description="Center latitude in decimal degrees (e.g., 37.5006)"),
+  area: str = Field(
+    "",
+    description="Regional context prepended to every category query (e.g., '역삼동', '역삼역')",
+  ),
+  amenities: Optional[Dict[str, int]] = Field(
+    None,
+    description=(
+      "Category query -> search radius in meters (max 10km). "
+      "Default: 지하철역 500, 버스정류장 1000, 대형마트 500, 편의점 500, 병원 1000, 학교 1000"
+    ),
+  ),
+  top: int = Field(3, description="Closest places returned per category (max: 5)", ge=1, le=5),
+  prefetch: int = Field(
+    1,
+    description="Result pages requested concurrently per category (default 1 = sequential, opt-in speculative paging)",
+    ge=1,
+    le=MAX_SEARCH_PAGES,
+  ),
+  bypass_index: bool = Field(False, description="Skip the local POI index and query Naver directly"),
+) -> Dict:
+  """
+  Runs a radius search for every category concurrently and summarizes each one.
   
-  return distance
\ No newline at end of file
+  Returns:
+    Dict: {"longitude", "latitude", "amenities": [...]} with one entry per category, in input order
+    Each entry includes: category, query, radius, success, and either
+    count (places found within radius), nearest_m and items (title, distance_m, latitude, longitude)
+    sorted by distance, or error.
+    count is the number of places found before the search stopped, not an exhaustive census.
+  """
+  started_at = time.perf_counter()
+  amenities = amenities if amenities is not None else DEFAULT_AMENITIES
+  if not amenities or len(amenities) > MAX_AMENITIES:
+    return {"success": False, "error": f"amenities must contain 1 to {MAX_AMENITIES} categories"}
+  invalid = [category for category, radius in amenities.items() if not 1 <= radius <= 10000]
+  if invalid:
+    return {"success": False, "error": f"radius must be between 1 and 10000m: {invalid}"}
+
+  try:
+    initialize()
+  except Exception as ex:
+    return {"success": False, "error": str(ex)}
+
+  async def sweep(category: str) -> Dict:
+    query = f"{area} {category}".strip()
+    search_stats = {"pages_searched": 0, "total_items_found": 0, "filtered_items": 0}
+    matches = await indexed_search_within_radius(
+      query, longitude, latitude, amenities[category], 5, "random", top, prefetch, search_stats,
+      bypass_index,
+    )
+    matches.sort(key=lambda match: match[1])
+    return {
+      "query": query,
+      "count": len(matches),
+      "nearest_m": round(matches[0][1]) if matches else None,
+      "items": [
+        {
+          "title": place.title,
+          "distance_m": round(distance),
+          "latitude": round(place.lat, 7),
+          "longitude": round(place.lon, 7),
+        }
+        for place, distance in matches[:top]
+      ],
+    }
+
+  categories = list(amenities)
+  results = await run_batch(categories, sweep, len(categories))
+  summary = []
+  for category, result in zip(categories, results):
+    entry = {"category": category, "radius": amenities[category], "success": result["success"]}
+    summary.append({**entry, **result["result"]} if result["success"] else {**entry, **result})
+
+  logger.info("amenitySweep", extra={"data": {
+    "input": {
+      "longitude": longitude, "latitude": latitude, "area": area, "amenities": amenities, "prefetch": prefetch,
+    },
+    "output": {entry["category"]: entry.get("count") for entry in summary},
+    "elapsed_ms": round((time.perf_counter() - started_at) * 1000, 1),
+  }})
+  return {"longitude": longitude, "latitude": latitude, "amenities": summary}
+
+
+@mcp.tool(description="Report cache hit/miss counters and other server statistics.")
+async def serverStats() -> Dict:
+  """
+  Returns:
+    Dict: Statistics of server-side caches (entries, hits, misses, evictions, errors, hit_rate)
+  """
+  try:
+    initialize()
+  except Exception as ex:
+    return {"success": False, "error": str(ex)}
+
+  return {
+    "geocode_cache": await geocode_cache.astats() if geocode_cache else None,
+    "poi_index": await poi_index.astats() if poi_index else None,
+    "upstream": naver_maps_client.stats(),
+  }
+
+
+async def run_batch(
+  inputs: List[Any], worker: Callable[[Any], Awaitable[Any]], concurrency: Optional[int]
+) -> List[Dict]:
+  """
+  입력 목록을 세마포어로 동시 실행 수를 제한하며 처리
+  각 항목의 성공 결과 또는 오류를 입력 순서대로 반환
+  """
+  if concurrency is None:
+    concurrency = int(os.getenv("NAVER_BATCH_CONCURRENCY", DEFAULT_BATCH_CONCURRENCY))
+  semaphore = asyncio.Semaphore(concurrency)
+
+  async def run(item: Any) -> Dict:
+    async with semaphore:
+      try:
+        return {"success": True, "result": await worker(item)}
+      except Exception as ex:
+        return {"success": False, "error": str(ex)}
+
+  return await asyncio.gather(*(run(item) for item in inputs))
+
+
+async def local_search_model(
+  query: str, display: int, sort: Literal["random", "comment"]
+) -> LocalSearchResponse:
+  page = await naver_maps_client.searchForLocalInformation(query, display, sort, 1)
+  return page.to_model()
+
+
+async def cached_geocode(
+  address: str, language: str, page: int, count: int, bypass_cache: bool = False
+) -> GeocodeResponse:
+  """
+  정규화된 주소 기준으로 캐시를 먼저 조회하고, 없으면 네이버 API 호출 후 저장
+  결과가 한 건이면 응답의 도로명/지번 주소 키에도 저장하여, 같은 건물을 다른 형식으로 조회해도 캐시를 사용
+  결과가 없는 응답은 저장하지 않음 (오타나 신축 주소가 TTL 동안 계속 "없음"으로 남지 않도록)
+  bypass_cache가 True이면 캐시 조회를 건너뛰고 새 결과로 캐시를 갱신
+  """
+  if geocode_cache is None:
+    return await naver_maps_client.geocode(address, language, page, count)
+
+  key = geocode_cache.make_key(address, language, page, count)
+  if not bypass_cache:
+    payload = await geocode_cache.aget(key)
+    if payload is not None:
+      return GeocodeResponse.model_validate_json(payload)
+
+  response = await naver_maps_client.geocode(address, language, page, count)
+  if response.status == "OK" and response.addresses:
+    keys = [key]
+    if len(response.addresses) == 1:
+      found = response.addresses[0]
+      for alias in address_aliases(found.roadAddress) | address_aliases(found.jibunAddress):
+        alias_key = geocode_cache.make_normalized_key(alias, language, page, count)
+        if alias_key != key:
+          keys.append(alias_key)
+    await geocode_cache.aput(keys, response.model_dump_json())
+  return response
+
+
+async def indexed_search_within_radius(
+  query: str,
+  longitude: float,
+  latitude: float,
+  radius: int,
+  display: int,
+  sort: Literal["random", "comment"],
+  min_results: int,
+  prefetch: int,
+  search_stats: Dict,
+  bypass_index: bool = False,
+) -> List[Tuple[Place, float]]:
+  """
+  POI 인덱스로 응답 가능하면 인덱스 결과를, 아니면 네이버 검색 결과를 (장소, 거리) 목록으로 반환
+  bypass_index가 True이면 인덱스 조회를 건너뛰고 새 검색 결과로 인덱스를 갱신
+  """
+  if poi_index is None:
+    return await search_within_radius(
+      query, longitude, latitude, radius, display, sort, min_results, prefetch, search_stats
+    )
+
+  query_key = poi_index.make_query_key(query, sort)
+  if not bypass_index:
+    matches = await poi_index.alookup(query_key, longitude, latitude, radius, min_results)
+    if matches is not None:
+      search_stats["source"] = "index"
+      search_stats["filtered_items"] = len(matches)
+      return matches
+
+  search_stats["source"] = "api"
+  matches = await search_within_radius(
+    query, longitude, latitude, radius, display, sort, min_results, prefetch, search_stats
+  )
+  poi_index.add_coverage(
+    query_key, longitude, latitude, radius, exhausted=len(matches) < min_results
+  )
+  return matches
+
+
+async def search_within_radius(
+  query: str,
+  longitude: float,
+  latitude: float,
+  radius: int,
+  display: int,
+  sort: Literal["random", "comment"],
+  min_results: int,
+  prefetch: int,
+  search_stats: Dict,
+) -> List[Tuple[Place, float]]:
+  """
+  반경 내 장소를 찾을 때까지 페이지를 순서대로 검색
+  최대 prefetch개 페이지를 미리 동시 요청하되, 결과는 항상 페이지 순서대로 처리하므로
+  순차 검색과 동일한 결과를 반환. 종료 조건을 만족하면 남은 요청은 취소
+  여러 페이지에 중복으로 나온 장소는 한 번만 포함하므로 결과 수가 페이지별 반경 내 항목 수의 합보다 적을 수 있음
+  """
+  from naver_map_mcp.geo import within_radius
+
+  matches = []
+  seen = set()
+  last_page = MAX_SEARCH_PAGES
+  next_page = 1
+  pending: Dict[int, asyncio.Task] = {}
+
+  try:
+    for page in range(1, MAX_SEARCH_PAGES + 1):
+      if page > last_page:
+        break
+
+      # 윈도우 크기만큼 다음 페이지를 미리 요청
+      while next_page <= last_page and len(pending) < prefetch:
+        pending[next_page] = asyncio.create_task(
+          naver_maps_client.searchForLocalInformation(query, display, sort, next_page)
+        )
+        next_page += 1
+
+      response = await pending.pop(page)
+      search_stats["pages_searched"] += 1
+
+      # 중간 조회 결과는 디버깅 시에만 로깅
+      if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("localSearchByCoordinate - Page results", extra={"data": {
+          "query": query,
+          "page": page,
+          "total": response.total,
+          "items": list(response.items),
+        }})
+
+      if not response.items:
+        break
+
+      search_stats["total_items_found"] += len(response.items)
+
+      # 반경과 무관하게 조회된 모든 장소를 인덱스에 저장 (page번째 요청의 start는 page)
+      if poi_index is not None:
+        poi_index.add_items(poi_index.make_query_key(query, sort), page, response.items)
+
+      # 좌표 기반 필터링 (사각형 사전 필터 + 벡터화된 Haversine 거리 계산)
+      indices, distances = within_radius(longitude, latitude, response.lons, response.lats, radius)
+      # 페이지가 겹쳐 같은 장소가 다시 나오면 한 번만 포함
+      for index, distance in zip(indices, distances):
+        place = response.items[index]
+        if place.key not in seen:
+          seen.add(place.key)
+          matches.append((place, float(distance)))
+          search_stats["filtered_items"] += 1
+
+      # 충분한 결과를 찾았거나 더 이상 결과가 없으면 종료
+      if len(matches) >= min_results or response.total <= page * display:
+        break
+
+      # 전체 결과 수를 넘어서는 페이지는 더 이상 요청하지 않음
+      last_page = min(last_page, math.ceil(response.total / display))
+  finally:
+    # 더 이상 필요 없는 선행 요청 취소
+    for task in pending.values():
+      task.cancel()
+    await asyncio.gather(*pending.values(), return_exceptions=True)
+
+  return matches
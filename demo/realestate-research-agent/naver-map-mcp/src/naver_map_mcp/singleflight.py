@@ -0,0 +1,54 @@
+import asyncio
+
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class _Flight:
+  __slots__ = ("task", "waiters")
+
+  def __init__(self, task: asyncio.Task):
+    self.task = task
+    self.waiters = 0
+
+
+class SingleFlight:
+  """
+  같은 키의 요청이 동시에 여러 번 들어오면 하나의 실행 결과를 공유 (in-flight 요청 병합)
+  - 첫 호출만 실제로 실행하고, 이후 호출은 진행 중인 작업의 결과(또는 예외)를 함께 받음
+  - 대기자 일부가 취소되어도 작업은 계속되며, 마지막 대기자가 취소되면 작업도 취소
+  - 완료된 결과는 보관하지 않음 (캐시가 아님)
+  """
+
+  def __init__(self):
+    self.executed = 0
+    self.coalesced = 0
+    self._flights: Dict[Hashable, _Flight] = {}
+
+  @property
+  def in_flight(self) -> int:
+    return len(self._flights)
+
+  async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+    flight = self._flights.get(key)
+    if flight is None:
+      flight = _Flight(asyncio.ensure_future(fn()))
+      self._flights[key] = flight
+      flight.task.add_done_callback(lambda _: self._forget(key, flight))
+      self.executed += 1
+    else:
+      self.coalesced += 1
+
+    flight.waiters += 1
+    try:
+      return await asyncio.shield(flight.task)
+    finally:
+      flight.waiters -= 1
+      if flight.waiters == 0 and not flight.task.done():
+        flight.task.cancel()
+        self._forget(key, flight)
+
+  def _forget(self, key: Hashable, flight: _Flight) -> None:
+    if self._flights.get(key) is flight:
+      del self._flights[key]
@@ -0,0 +1,57 @@
+import asyncio
+import logging
+import os
+import sqlite3
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+logger = logging.getLogger('naver_map_mcp')
+
+
+class SqliteWorker:
+  """
+  SQLite 연결 하나를 전용 스레드 하나에서만 사용하도록 감싸는 실행기
+  - 모든 DB 작업을 전용 스레드에서 제출 순서대로 실행하므로 이벤트 루프를 막지 않음
+  - 같은 파일을 쓰는 다른 워커 프로세스가 잠금을 잡고 있으면 busy_timeout 동안 전용 스레드에서만 대기
+  - 결과가 필요 없는 쓰기는 submit()으로 백그라운드 실행 (실패는 로그로만 남김)
+  """
+
+  def __init__(self, path: str, busy_timeout: float = 5.0):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite")
+    self.conn: sqlite3.Connection = self._executor.submit(
+      sqlite3.connect, path, timeout=busy_timeout, check_same_thread=False
+    ).result()
+    self.call(self.conn.execute, "PRAGMA journal_mode=WAL")
+
+  def call(self, fn: Callable[..., T], *args: Any) -> T:
+    """
+    전용 스레드에서 실행하고 완료될 때까지 대기 (초기화/종료 등 이벤트 루프 밖에서 사용)
+    """
+    return self._executor.submit(fn, *args).result()
+
+  async def run(self, fn: Callable[..., T], *args: Any) -> T:
+    """
+    전용 스레드에서 실행하고 결과를 비동기로 대기
+    """
+    return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+  def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+    """
+    전용 스레드에서 백그라운드로 실행 (결과를 기다리지 않음)
+    """
+    future = self._executor.submit(fn, *args)
+    future.add_done_callback(self._log_failure)
+    return future
+
+  @staticmethod
+  def _log_failure(future: Future) -> None:
+    if not future.cancelled() and future.exception() is not None:
+      logger.warning("sqlite background write failed", extra={"data": {"error": str(future.exception())}})
+
+  def close(self) -> None:
+    self.call(self.conn.close)
+    self._executor.shutdown()
@@ -0,0 +1,104 @@
+"""
+DAG 파이프라인 실행기
+
+매물 수집 → (입지 분석 ∥ 권리 분석) → ROI 계산 → 리포트처럼 순서가 정해진 흐름을 LLM 오케스트레이터 없이 코드로 실행합니다.
+각 노드는 선행 노드가 끝나는 즉시 시작하므로 서로 의존하지 않는 노드는 동시에 실행되고,
+선행 노드의 결과가 다음 노드의 입력으로 전달됩니다. 노드별 시작/종료 시각과 소요 시간을 기록합니다.
+"""
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+
+@dataclass
+class Node:
+    name: str
+    run: Callable[[Dict[str, Any]], Awaitable[Any]]  # 선행 노드 결과 {노드 이름: 결과}를 받아 이 노드의 결과를 반환
+    deps: Tuple[str, ...] = ()
+
+
+class SkippedError(Exception):
+    """
+    선행 노드가 실패하여 실행하지 않은 노드
+    """
+
+
+class Pipeline:
+    def __init__(self, nodes: List[Node], tracker=None):
+        """
+        Args:
+            nodes: 실행할 노드 목록 (선행 노드가 목록에 없거나 순환 의존이 있으면 ValueError)
+            tracker: 노드 시작/종료를 진행 이벤트로 전달할 ProgressTracker (생략 가능)
+        """
+        self.nodes = {node.name: node for node in nodes}
+        self.tracker = tracker
+        self.order = self._topological_order()
+        self.timings: List[Dict] = []
+
+    def _topological_order(self) -> List[str]:
+        order = []
+        state = {}
+
+        def visit(name: str, path: Tuple[str, ...]) -> None:
+            if name not in self.nodes:
+                raise ValueError(f"Unknown pipeline node: {name} (required by {path[-1]})")
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"Pipeline cycle: {' → '.join(path + (name,))}")
+            state[name] = "visiting"
+            for dep in self.nodes[name].deps:
+                visit(dep, path + (name,))
+            state[name] = "done"
+            order.append(name)
+
+        for name in self.nodes:
+            visit(name, ())
+        return order
+
+    async def run_async(self) -> Dict[str, Any]:
+        """
+        모든 노드를 의존 순서대로 실행하고 {노드 이름: 결과}를 반환
+        실패한 노드의 결과는 예외 객체이며, 그 이후 노드는 SkippedError로 표시
+        """
+        self.timings = []
+        tasks: Dict[str, asyncio.Task] = {}
+        origin = time.perf_counter()
+
+        async def execute(node: Node) -> Any:
+            inputs = {}
+            for dep in node.deps:
+                try:
+                    inputs[dep] = await tasks[dep]
+                except Exception:
+                    self.timings.append({"node": node.name, "status": "skipped"})
+                    raise SkippedError(f"{node.name}: {dep} did not complete")
+
+            started = time.perf_counter()
+            timing = {"node": node.name, "status": "ok", "start_s": round(started - origin, 3)}
+            try:
+                if self.tracker is None:
+                    return await node.run(inputs)
+                with self.tracker.span("pipeline", "node", node.name):
+                    return await node.run(inputs)
+            except Exception as e:
+                timing.update(status="error", error=str(e))
+                raise
+            finally:
+                ended = time.perf_counter()
+                timing["end_s"] = round(ended - origin, 3)
+                timing["elapsed_s"] = round(ended - started, 3)
+                self.timings.append(timing)
+
+        for name in self.order:
+            tasks[name] = asyncio.ensure_future(execute(self.nodes[name]))
+        results = await asyncio.gather(*tasks.values(), return_exceptions=True)
+        self.timings.sort(key=lambda timing: self.order.index(timing["node"]))
+        return dict(zip(tasks, results))
+
+    def run(self) -> Dict[str, Any]:
+        """
+        동기 코드에서 호출하기 위한 run_async 래퍼
+        """
+        return asyncio.run(self.run_async())
@@ -0,0 +1,286 @@
+"""
+HTML 리포트 렌더러
+
+ROI 계산 결과(CSV)와 매물/입지/권리 분석 결과를 결합해 `output/..._5_report.html`을 템플릿으로 생성합니다.
+템플릿(templates/report.html)은 한 번만 읽어 블록별 string.Template으로 컴파일해 두고,
+매물 카드를 렌더링하는 대로 파일에 바로 기록하므로 수백 건 규모의 리포트도 수 밀리초 내에 만들어집니다.
+모델은 매물별 한두 문장의 코멘트(narratives)만 제공하면 됩니다.
+"""
+import csv
+import html
+import json
+import math
+import os
+import re
+import time
+from datetime import datetime
+from functools import lru_cache
+from string import Template
+from typing import Dict, List, Optional
+
+from strands.tools import tool
+
+from checkpoint import record_artifact
+
+TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates", "report.html")
+BLOCK_MARKER = re.compile(r"^<!-- block:(\w+) -->\n", re.MULTILINE)
+
+# 투자 주의 매물 기준 (ROI 계산 원칙의 D급 또는 ROI 10% 이하)
+CAUTION_GRADES = {"D"}
+CAUTION_ROI = 10.0
+
+# CSS 클래스로 쓰이는 값 (모델 출력이 그대로 들어가지 않도록 허용 목록으로 제한)
+GRADE_CLASSES = {"s", "a", "b", "c", "d"}
+RISK_LEVELS = {"low", "medium", "high"}
+
+
+@lru_cache(maxsize=None)
+def load_template(path: str = TEMPLATE_PATH) -> Dict[str, Template]:
+    """
+    템플릿 파일을 블록(head, card, caution_head, caution_row, caution_tail, tail)별로 나누어 컴파일
+    """
+    with open(path, encoding="utf-8") as f:
+        parts = BLOCK_MARKER.split(f.read())
+    blocks = {"head": parts[0]}
+    blocks.update(zip(parts[1::2], parts[2::2]))
+    return {name: Template(text) for name, text in blocks.items()}
+
+
+def format_eok(value: Optional[float]) -> str:
+    """
+    원 단위 금액을 억 단위로 표시 (예: 1248000000 → 12.48억)
+    """
+    if value is None:
+        return "-"
+    return f"{value / 100_000_000:,.2f}".rstrip("0").rstrip(".") + "억"
+
+
+def _number(value) -> Optional[float]:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(number) else number
+
+
+def _records(path: str) -> Dict[str, Dict]:
+    """
+    분석 결과 파일(목록 또는 {"properties": [...]})을 사건번호별 레코드로 변환
+    """
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("properties", [])
+    return {record.get("case_number"): record for record in data if isinstance(record, dict)}
+
+
+def load_roi_rows(roi_file: str) -> List[Dict]:
+    """
+    ROI CSV를 읽어 ROI 내림차순으로 정렬 (ROI를 계산할 수 없는 매물은 마지막)
+    """
+    with open(roi_file, encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    for row in rows:
+        row["ROI"] = _number(row.get("ROI"))
+    rows.sort(key=lambda row: (row["ROI"] is None, -(row["ROI"] or 0)))
+    return rows
+
+
+def _allowed(value, allowed, default: str) -> str:
+    return value if isinstance(value, str) and value in allowed else default
+
+
+def _bullets(items: List[str]) -> str:
+    return "<br>\n                            ".join(f"• {html.escape(item)}" for item in items if item) or "• 분석 정보 없음"
+
+
+def _location_notes(record: Dict) -> List[str]:
+    analysis = record.get("location_analysis", record)
+    notes = []
+    subway = analysis.get("subway_access") or {}
+    if subway.get("nearest_station"):
+        line = f"({subway['line']})" if subway.get("line") else ""
+        distance = f" 도보 {subway['distance_m']}m" if subway.get("distance_m") is not None else ""
+        notes.append(f"{subway['nearest_station']}{line}{distance}")
+    if analysis.get("bus_stops_1km") is not None:
+        notes.append(f"1km 내 버스정류장 {analysis['bus_stops_1km']}곳")
+    schools = (analysis.get("amenities") or {}).get("schools") or []
+    if schools:
+        notes.append("학군: " + ", ".join(schools[:3]))
+    notes.append(analysis.get("remarks", ""))
+    return notes
+
+
+def _right_notes(row: Dict, record: Dict) -> List[str]:
+    notes = []
+    mortgage = record.get("mortgage") or {}
+    if mortgage.get("amount"):
+        notes.append(f"근저당 {format_eok(_number(mortgage['amount']))} → {mortgage.get('status', '확인 필요')}")
+    encumbrance = _number(row.get("인수부담액")) or 0
+    notes.append(f"인수부담액 {format_eok(encumbrance)}" if encumbrance else "인수 권리 없음")
+    clearance = _number(row.get("명도비용"))
+    if clearance:
+        notes.append(f"명도비용 약 {clearance / 10_000:,.0f}만원")
+    notes.append(record.get("notes", ""))
+    return notes
+
+
+def _caution_reason(row: Dict) -> str:
+    market_price = _number(row.get("주변시세"))
+    appraisal = _number(row.get("감정가"))
+    reasons = []
+    if row["ROI"] is None:
+        reasons.append("주변시세 정보 없음")
+    elif market_price is not None and appraisal is not None and market_price < appraisal:
+        reasons.append(f"주변시세({format_eok(market_price)}) < 감정가({format_eok(appraisal)})")
+    if _number(row.get("인수부담액")):
+        reasons.append(f"인수부담 {format_eok(_number(row['인수부담액']))}")
+    if row.get("권리등급") == "C":
+        reasons.append("C등급 권리")
+    return ", ".join(reasons) or "기대 수익률 낮음"
+
+
+def render_report_file(
+    roi_file: str,
+    output_file: str,
+    listing_file: str = "",
+    location_file: str = "",
+    right_file: str = "",
+    top_n: int = 5,
+    narratives: Optional[Dict[str, str]] = None,
+    title: str = "",
+    report_date: Optional[datetime] = None,
+) -> Dict:
+    """
+    ROI 상위 top_n개 매물 카드와 투자 주의 매물 표를 렌더링하여 output_file에 스트리밍으로 기록
+    top_n이 0이면 모든 매물을 카드로 표시
+    narratives: {사건번호: 코멘트}, "summary" 키는 리포트 상단 요약으로 표시
+    """
+    template = load_template()
+    narratives = narratives or {}
+    report_date = report_date or datetime.now()
+    rows = load_roi_rows(roi_file)
+    listings = _records(listing_file)
+    locations = _records(location_file)
+    rights = _records(right_file)
+
+    top = rows[:top_n] if top_n else rows
+    rest = rows[len(top):]
+    ranked = [row for row in rows if row["ROI"] is not None]
+    profits = [_number(row.get("순이익")) for row in ranked]
+    scores = [
+        _number(record.get("location_analysis", record).get("location_score")) for record in locations.values()
+    ]
+    scores = [score for score in scores if score is not None]
+    best_roi = ranked[0]["ROI"] if ranked else None
+
+    summary = narratives.get("summary", "")
+    with open(output_file, "w", encoding="utf-8") as f:
+        f.write(template["head"].substitute(
+            title=html.escape(title or f"경매 아파트 TOP {len(top)} 투자 리포트"),
+            report_date=f"{report_date:%Y년 %m월 %d일}",
+            count=len(rows),
+            best_roi=f"{best_roi:.2f}%" if best_roi is not None else "-",
+            best_profit=format_eok(max((p for p in profits if p is not None), default=None)),
+            average_location_score=f"{sum(scores) / len(scores):.1f}점" if scores else "-",
+            summary=f'        <p class="narrative">{html.escape(summary)}</p>\n' if summary else "",
+            top_n=len(top),
+        ))
+
+        for rank, row in enumerate(top, start=1):
+            case_number = row.get("사건번호", "")
+            listing = listings.get(case_number, {})
+            location = locations.get(case_number, {})
+            right = rights.get(case_number, {})
+            location_score = _number(location.get("location_analysis", location).get("location_score"))
+            roi = row["ROI"]
+            narrative = narratives.get(case_number, "")
+            f.write(template["card"].substitute(
+                rank=rank,
+                name=html.escape(f"{row.get('동', '')} {row.get('단지명', '')}".strip() or case_number),
+                case_number=html.escape(case_number),
+                district=html.escape(" ".join(listing.get("address", "").split()[1:3])),
+                grade=html.escape(row.get("투자등급") or "-"),
+                grade_class=_allowed((row.get("투자등급") or "").lower(), GRADE_CLASSES, "d"),
+                appraisal_value=format_eok(_number(row.get("감정가"))),
+                failed_count=html.escape(str(listing.get("failed_count", 0))),
+                minimum_bid=format_eok(_number(row.get("최저가"))),
+                market_price=format_eok(_number(row.get("주변시세"))),
+                roi=f"{roi:.2f}%" if roi is not None else "-",
+                roi_class="highlight" if (roi or 0) > 0 else "danger",
+                net_profit=format_eok(_number(row.get("순이익"))),
+                bid_date=html.escape(str(listing.get("bid_date", "-")).replace("-", ".")),
+                roi_width=round(max(roi or 0, 0) / best_roi * 100) if best_roi and best_roi > 0 else 0,
+                location_risk="low" if (location_score or 0) >= 80 else "medium" if (location_score or 0) >= 60 else "high",
+                location_score=f"{location_score:.0f}" if location_score is not None else "-",
+                location_notes=_bullets(_location_notes(location)),
+                risk_level=_allowed(right.get("risk_level"), RISK_LEVELS, "medium"),
+                right_grade=html.escape(row.get("권리등급") or "-"),
+                right_notes=_bullets(_right_notes(row, right)),
+                narrative=f'                <p class="narrative">💬 {html.escape(narrative)}</p>\n' if narrative else "",
+            ))
+
+        cautions = [
+            row for row in rest
+            if row["ROI"] is None or row["ROI"] <= CAUTION_ROI or row.get("투자등급") in CAUTION_GRADES
+        ]
+        if cautions:
+            f.write(template["caution_head"].substitute())
+            for row in cautions:
+                case_number = row.get("사건번호", "")
+                f.write(template["caution_row"].substitute(
+                    name=html.escape(f"{row.get('동', '')} {row.get('단지명', '')}".strip()),
+                    case_number=html.escape(case_number),
+                    roi=f"{row['ROI']:.2f}%" if row["ROI"] is not None else "-",
+                    roi_color="#ff6b6b" if row["ROI"] is None or row["ROI"] < 0 else "#ffd700",
+                    reason=html.escape(_caution_reason(row)),
+                ))
+            f.write(template["caution_tail"].substitute())
+
+        f.write(template["tail"].substitute(generated_date=f"{datetime.now():%Y-%m-%d}"))
+
+    record_artifact(output_file, [roi_file])
+
+    return {
+        "output_file": output_file,
+        "count": len(rows),
+        "top": [row.get("사건번호") for row in top],
+        "cautions": len(cautions),
+    }
+
+
+@tool
+def render_report(
+    roi_file: str,
+    output_file: str,
+    listing_file: str = "",
+    location_file: str = "",
+    right_file: str = "",
+    top_n: int = 5,
+    narratives: str = "",
+) -> str:
+    """
+    ROI 결과와 매물/입지/권리 분석 결과로 최종 HTML 리포트를 생성합니다 (ROI 순 정렬, 상위 top_n개 매물 카드 + 투자 주의 매물 표).
+    리포트 HTML을 직접 작성하지 말고 이 도구를 사용하세요. 매물별 한두 문장의 코멘트만 narratives로 전달하면 됩니다.
+
+    Args:
+        roi_file: ROI 계산 결과 CSV 파일 경로 (예: output/강남권_251202_4_roi.csv)
+        output_file: 저장할 HTML 리포트 경로 (예: output/강남권_251202_5_report.html)
+        listing_file: 매물 목록 JSON 파일 경로 (입찰기일, 유찰 횟수 표시)
+        location_file: 입지 분석 JSON 파일 경로
+        right_file: 권리 분석 JSON 파일 경로
+        top_n: 카드로 표시할 상위 매물 수 (0이면 전체)
+        narratives: {"사건번호": "코멘트", "summary": "전체 요약"} 형태의 JSON 문자열 (생략 가능)
+    """
+    try:
+        started = time.perf_counter()
+        result = render_report_file(
+            roi_file, output_file, listing_file, location_file, right_file, top_n,
+            json.loads(narratives) if narratives else None,
+        )
+        result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return json.dumps(result, ensure_ascii=False)
+    except Exception as e:
+        return f"Error in report renderer: {str(e)}"
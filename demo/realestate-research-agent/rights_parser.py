@@ -0,0 +1,255 @@
+"""
+경매 권리관계 문자열 파서
+
+매물의 `encumbrances` 문자열(예: "근저당 12억(신한은행), 가압류 5000만(개인)")을
+권리 종류, 금액(원), 채권자, 건수, 부존재 여부로 구조화합니다.
+규칙 기반이므로 결과가 항상 같고, 수천 건도 즉시 처리합니다.
+선순위 판단처럼 문자열만으로 결정할 수 없는 부분은 `needs_review`로 표시하여
+에이전트가 판단하도록 합니다.
+"""
+import json
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from strands.tools import tool
+
+# 표기 변형 → 표준 권리 종류
+RIGHT_TYPES = {
+    "근저당권": "근저당",
+    "근저당": "근저당",
+    "저당권": "저당권",
+    "저당": "저당권",
+    "전세권": "전세권",
+    "전세": "전세권",
+    "임차권": "임차권",
+    "임차인": "임차권",
+    "임차": "임차권",
+    "가압류": "가압류",
+    "압류": "압류",
+    "가처분": "가처분",
+    "가등기": "가등기",
+    "지상권": "지상권",
+    "법정지상권": "법정지상권",
+    "지역권": "지역권",
+    "유치권": "유치권",
+    "예고등기": "예고등기",
+    "환매등기": "환매등기",
+}
+LEASE_TYPES = {"전세권", "임차권"}
+MORTGAGE_TYPES = {"근저당", "저당권"}
+
+# 금액이 있어야 의미가 있는 권리 (금액이 없으면 검토 필요)
+MONETARY_TYPES = MORTGAGE_TYPES | LEASE_TYPES | {"가압류"}
+# 금액과 무관하게 낙찰자 인수 여부를 문자열만으로 판단할 수 없는 권리
+REVIEW_TYPES = {
+    "가처분", "가등기", "지상권", "법정지상권", "지역권", "유치권", "예고등기", "환매등기",
+}
+
+ABSENT_MARKERS = ("해당없음", "없음", "없슴", "미설정", "무")
+UNKNOWN_MARKERS = ("미상", "불명", "확인필요", "확인 필요")
+
+SEPARATORS = ",，、;/"
+CONJUNCTION = re.compile(r"\s+및\s+")
+SEGMENT = re.compile(
+    r"^(?P<type>" + "|".join(sorted(RIGHT_TYPES, key=len, reverse=True)) + r")"
+    r"\s*(?P<value>[^()（）]*?)\s*(?:[(（](?P<creditor>[^)）]*)[)）])?\s*$"
+)
+COUNT = re.compile(r"^(?P<count>\d+)\s*건$")
+PLAIN_NUMBER = re.compile(r"^\d+(?:\.\d+)?$")
+SMALL_UNITS = re.compile(r"(\d+(?:\.\d+)?)(천|백|십)?")
+SMALL_MULTIPLIERS = {"천": 1000, "백": 100, "십": 10, None: 1, "": 1}
+AMOUNT_UNITS = ("억", "만", "원")
+# 이보다 작은 금액은 표기 오류(단위 누락 등)일 가능성이 높아 검토 필요로 표시
+MIN_PLAUSIBLE_AMOUNT = 1_000_000
+
+
+@dataclass
+class Encumbrance:
+    right_type: str               # 표준 권리 종류 (예: 근저당, 전세권, 가압류)
+    present: bool                 # "전세권 없음"처럼 부존재가 명시되면 False
+    amount: Optional[int] = None  # 원 단위 금액
+    creditor: Optional[str] = None
+    count: Optional[int] = None   # "압류 1건"처럼 건수로 표기된 경우
+    needs_review: bool = False    # 문자열만으로 판단할 수 없어 에이전트 검토가 필요한 항목
+    raw: str = ""
+
+
+def _parse_small(text: str) -> Optional[float]:
+    """
+    만 단위 이하 표기를 숫자로 변환 (예: 5000 → 5000, 5천 → 5000, 2천500 → 2500)
+    """
+    if not text:
+        return 0
+    total = 0.0
+    position = 0
+    for match in SMALL_UNITS.finditer(text):
+        if match.start() != position:
+            return None
+        total += float(match.group(1)) * SMALL_MULTIPLIERS[match.group(2)]
+        position = match.end()
+    return total if position == len(text) else None
+
+
+def parse_amount(text: str) -> Optional[int]:
+    """
+    억/만 단위가 섞인 금액 표기를 원 단위 정수로 변환. 해석할 수 없으면 None
+    예: 9억 → 900000000, 2억5천 → 250000000, 1억2000만 → 120000000, 5000만 → 50000000,
+        3,000만원 → 30000000, 1.5억 → 150000000, 300000000 → 300000000
+    """
+    text = re.sub(r"[\s,]", "", text)
+    text = text.removesuffix("원")
+    if not text:
+        return None
+    if PLAIN_NUMBER.match(text):
+        return round(float(text))
+
+    eok = 0.0
+    if "억" in text:
+        head, _, text = text.partition("억")
+        if not PLAIN_NUMBER.match(head):
+            return None
+        eok = float(head)
+
+    # 억 뒤의 나머지는 단위가 생략되어도 만 단위로 해석 (2억5천 = 2억 5천만)
+    man = _parse_small(text.removesuffix("만"))
+    if man is None or (not eok and not text.endswith("만")):
+        return None
+    return round(eok * 100_000_000 + man * 10_000)
+
+
+def split_segments(text: str) -> List[str]:
+    """
+    권리관계 문자열을 권리별 구간으로 분리
+    괄호 안(채권자 목록)의 구분자와 숫자 사이의 쉼표(천 단위 구분)에서는 나누지 않음
+    예: "가압류 5,000만원(주식회사 A, B), 압류 1건"
+        → ["가압류 5,000만원(주식회사 A, B)", "압류 1건"]
+    """
+    segments = []
+    start = 0
+    depth = 0
+    i = 0
+    while i < len(text):
+        char = text[i]
+        if char in "(（":
+            depth += 1
+        elif char in ")）":
+            depth = max(depth - 1, 0)
+        elif depth == 0:
+            conjunction = CONJUNCTION.match(text, i)
+            between_digits = (
+                char in ",，" and text[i - 1:i].isdigit() and text[i + 1:i + 2].isdigit()
+            )
+            if conjunction or (char in SEPARATORS and not between_digits):
+                segments.append(text[start:i])
+                start = i = conjunction.end() if conjunction else i + 1
+                continue
+        i += 1
+    segments.append(text[start:])
+    return [segment.strip() for segment in segments if segment.strip()]
+
+
+def parse_encumbrance(text: str) -> List[Dict]:
+    """
+    권리관계 문자열 하나를 권리별 레코드 목록으로 변환
+    """
+    records = []
+    for segment in split_segments((text or "").strip()):
+        match = SEGMENT.match(segment)
+        if match is None:
+            records.append(Encumbrance("기타", True, needs_review=True, raw=segment))
+            continue
+
+        value = match.group("value").strip()
+        right_type = RIGHT_TYPES[match.group("type")]
+        record = Encumbrance(
+            right_type,
+            True,
+            creditor=(match.group("creditor") or "").strip() or None,
+            raw=segment,
+        )
+
+        if value.replace(" ", "") in ABSENT_MARKERS:
+            record.present = False
+        elif any(marker in value for marker in UNKNOWN_MARKERS):
+            record.needs_review = True
+        elif COUNT.match(value):
+            record.count = int(COUNT.match(value).group("count"))
+        elif value:
+            record.amount = parse_amount(value)
+            # 단위가 없는 금액("근저당 5000")이나 지나치게 작은 금액은 원 단위인지 확신할 수 없음
+            record.needs_review = (
+                record.amount is None
+                or not any(unit in value for unit in AMOUNT_UNITS)
+                or record.amount < MIN_PLAUSIBLE_AMOUNT
+            )
+
+        if record.present and right_type in MONETARY_TYPES and record.amount is None:
+            record.needs_review = True
+        if record.present and right_type in REVIEW_TYPES:
+            record.needs_review = True
+        records.append(record)
+
+    return [vars(record) for record in records]
+
+
+def summarize(records: List[Dict]) -> Dict:
+    """
+    권리별 레코드를 매물 단위 합계로 요약 (선순위 여부와 인수 여부는 판단하지 않음)
+    """
+    present = [record for record in records if record["present"]]
+
+    def total(types) -> int:
+        return sum(r["amount"] or 0 for r in present if r["right_type"] in types)
+
+    return {
+        "mortgage_total": total(MORTGAGE_TYPES),
+        "lease_deposits": total(LEASE_TYPES),
+        "provisional_seizure_total": total({"가압류"}),
+        "seizure_count": sum(r["count"] or 1 for r in present if r["right_type"] == "압류"),
+        "right_types": sorted({record["right_type"] for record in present}),
+        "needs_review": any(record["needs_review"] for record in records),
+    }
+
+
+def parse_listings(listings: List[Dict]) -> List[Dict]:
+    """
+    매물 목록 전체의 권리관계를 파싱 (입력 순서 유지)
+    """
+    results = []
+    for listing in listings:
+        records = parse_encumbrance(listing.get("encumbrances", ""))
+        results.append({
+            "case_number": listing.get("case_number"),
+            "encumbrances": listing.get("encumbrances", ""),
+            "rights": records,
+            "summary": summarize(records),
+        })
+    return results
+
+
+@tool
+def parse_encumbrances(listing_file: str, output_file: str = "") -> str:
+    """
+    매물 목록 파일의 권리관계(encumbrances) 문자열을 모두 구조화합니다.
+    권리 종류, 원 단위 금액(억/만 단위 변환), 채권자, 건수, 부존재("없음") 여부와
+    매물별 합계를 반환합니다.
+    needs_review가 true인 항목만 추가로 판단하면 됩니다.
+
+    Args:
+        listing_file: 매물 목록 JSON 파일 경로 (예: output/강남권_251202_1_listing.json)
+        output_file: 파싱 결과를 저장할 JSON 파일 경로 (생략하면 저장하지 않음)
+    """
+    try:
+        with open(listing_file, encoding="utf-8") as f:
+            listings = json.load(f)
+        if isinstance(listings, dict):
+            listings = listings.get("properties", [])
+
+        results = parse_listings(listings)
+        if output_file:
+            with open(output_file, "w", encoding="utf-8") as f:
+                json.dump(results, f, ensure_ascii=False, indent=2)
+        return json.dumps(results, ensure_ascii=False)
+    except Exception as e:
+        return f"Error in encumbrance parser: {str(e)}"
@@ -0,0 +1,186 @@
+"""
+ROI 계산 엔진
+
+ROI_계산_프롬프트의 계산 공식을 매물/입지/권리 분석 결과 전체에 대해 한 번에(벡터화) 계산합니다.
+LLM이 매물마다 계산기를 호출하는 대신, 결정적인 결과를 `output/..._4_roi.csv` 형식으로 생성합니다.
+"""
+import json
+import re
+
+import numpy as np
+import pandas as pd
+from strands.tools import tool
+
+from checkpoint import record_artifact
+
+# 계산 공식 상수 (ROI_계산_프롬프트 기준)
+FAILED_BID_PREMIUM = 0.05     # 유찰 1회당 예상 낙찰가 가산율
+ACQUISITION_TAX_RATE = 0.046  # 취득세
+SALE_PRICE_RATIO = 0.95       # 예상 매각가 = 주변시세 × 0.95 (보수적 추정)
+CAPITAL_GAINS_TAX_RATE = 0.35 # 양도세(추정), 양도차익이 있을 때만 부과
+
+# 권리 분석 리스크 → 권리등급
+RIGHT_GRADES = {"low": "A", "medium": "B", "high": "C"}
+
+ROI_COLUMNS = [
+    "사건번호", "동", "단지명", "감정가", "최저가", "주변시세", "권리등급", "인수부담액", "명도비용",
+    "예상낙찰가", "총투자금", "예상매각가", "순이익", "ROI", "투자등급",
+]
+
+
+def _records(data) -> list:
+    """
+    분석 결과 파일은 목록 또는 {"properties": [...]} 형태이므로 매물 목록만 추출
+    """
+    if isinstance(data, dict):
+        return data.get("properties", [])
+    return data
+
+
+def _load(path: str) -> list:
+    with open(path, encoding="utf-8") as f:
+        return _records(json.load(f))
+
+
+def _complex_name(address: str, dong: str) -> str:
+    """
+    주소의 단지명에서 동 이름과 '아파트'를 제외 (예: 역삼래미안아파트 → 래미안)
+    """
+    match = re.search(r"(\S+?)(?:아파트|오피스텔)", address)
+    if not match:
+        return ""
+    name = match.group(1)
+    stem = dong[:-1] if dong.endswith("동") else dong
+    if stem and name.startswith(stem) and len(name) > len(stem):
+        name = name[len(stem):]
+    return name
+
+
+def build_frame(listings: list, locations: list, rights: list) -> pd.DataFrame:
+    """
+    매물 목록을 기준으로 입지 분석(주변시세, 위치 점수)과 권리 분석(인수부담액, 명도비용, 리스크)을 사건번호로 결합
+    """
+    listing_frame = pd.DataFrame(listings)
+    if listing_frame.empty:
+        listing_frame = pd.DataFrame(
+            columns=["case_number", "address", "appraisal_value", "minimum_bid", "failed_count"]
+        )
+
+    location_frame = pd.DataFrame([
+        {
+            "case_number": record.get("case_number"),
+            "market_price_nearby": record.get("location_analysis", record).get("market_price_nearby"),
+            "location_score": record.get("location_analysis", record).get("location_score"),
+        }
+        for record in locations
+    ], columns=["case_number", "market_price_nearby", "location_score"])
+
+    right_frame = pd.DataFrame([
+        {
+            "case_number": record.get("case_number"),
+            "total_encumbrance": record.get("total_encumbrance", 0),
+            "clearance_cost": record.get("clearance_cost", 0),
+            "risk_level": record.get("risk_level"),
+        }
+        for record in rights
+    ], columns=["case_number", "total_encumbrance", "clearance_cost", "risk_level"])
+
+    frame = (
+        listing_frame
+        .merge(location_frame.drop_duplicates("case_number"), on="case_number", how="left")
+        .merge(right_frame.drop_duplicates("case_number"), on="case_number", how="left")
+    )
+    frame["failed_count"] = frame["failed_count"].fillna(0)
+    frame["total_encumbrance"] = frame["total_encumbrance"].fillna(0)
+    frame["clearance_cost"] = frame["clearance_cost"].fillna(0)
+    return frame
+
+
+def compute_roi(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    ROI 계산 공식을 모든 매물에 대해 벡터 연산으로 적용하여 ROI CSV 열을 생성
+    1. 예상 낙찰가 = 최저가 × (1 + 유찰횟수 × 0.05)
+    2. 총 투자금 = 낙찰가 + 인수부담액 + 명도비용 + 취득세(4.6%)
+    3. 예상 매각가 = 주변시세 × 0.95
+    4. 순이익 = 매각가 - 총투자금 - 양도세(양도차익의 35%, 추정)
+    5. ROI = 순이익 / 총투자금 × 100
+    주변시세를 알 수 없는 매물은 매각가 이후 항목과 투자등급을 비워 둠
+    """
+    minimum_bid = frame["minimum_bid"].to_numpy(dtype=float)
+    failed_count = frame["failed_count"].to_numpy(dtype=float)
+    encumbrance = frame["total_encumbrance"].to_numpy(dtype=float)
+    clearance = frame["clearance_cost"].to_numpy(dtype=float)
+    market_price = frame["market_price_nearby"].to_numpy(dtype=float)
+    location_score = frame["location_score"].to_numpy(dtype=float)
+    risk = frame["risk_level"].fillna("").to_numpy(dtype=object)
+
+    expected_bid = np.round(minimum_bid * (1 + failed_count * FAILED_BID_PREMIUM))
+    total_investment = np.round(expected_bid * (1 + ACQUISITION_TAX_RATE) + encumbrance + clearance)
+    expected_sale = np.round(market_price * SALE_PRICE_RATIO)
+    gain = expected_sale - total_investment
+    net_profit = np.round(gain - np.maximum(gain, 0) * CAPITAL_GAINS_TAX_RATE)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        roi = np.round(net_profit / total_investment * 100, 2)
+
+    grade = np.select(
+        [
+            (roi > 50) & (location_score > 80) & (risk == "low"),
+            (roi > 30) & (location_score > 70) & np.isin(risk, ["low", "medium"]),
+            (roi > 20) & (location_score > 60),
+            roi > 10,
+        ],
+        ["S", "A", "B", "C"],
+        default="D",
+    )
+    grade = np.where(np.isnan(roi), "", grade)
+
+    dong = frame["address"].str.extract(r"(\S+동)\s", expand=False).fillna("")
+    result = pd.DataFrame({
+        "사건번호": frame["case_number"],
+        "동": dong,
+        "단지명": [_complex_name(address, name) for address, name in zip(frame["address"], dong)],
+        "감정가": frame["appraisal_value"],
+        "최저가": frame["minimum_bid"],
+        "주변시세": frame["market_price_nearby"],
+        "권리등급": frame["risk_level"].map(RIGHT_GRADES).fillna(""),
+        "인수부담액": encumbrance,
+        "명도비용": clearance,
+        "예상낙찰가": expected_bid,
+        "총투자금": total_investment,
+        "예상매각가": expected_sale,
+        "순이익": net_profit,
+        "ROI": roi,
+        "투자등급": grade,
+    }, columns=ROI_COLUMNS)
+
+    # 금액 열은 정수로 표시 (주변시세를 모르는 매물은 빈 값)
+    money_columns = ["감정가", "최저가", "주변시세", "인수부담액", "명도비용", "예상낙찰가", "총투자금", "예상매각가", "순이익"]
+    result[money_columns] = result[money_columns].astype("Int64")
+    return result
+
+
+@tool
+def roi_batch(listing_file: str, location_file: str, right_file: str, output_file: str) -> str:
+    """
+    매물/입지 분석/권리 분석 결과 파일을 사건번호로 결합하여 모든 매물의 ROI를 한 번에 계산하고 CSV로 저장합니다.
+    계산 공식과 투자등급 기준은 ROI 계산 원칙과 동일하며, 결과는 결정적입니다.
+
+    Args:
+        listing_file: 매물 목록 JSON 파일 경로 (예: output/강남권_251202_1_listing.json)
+        location_file: 입지 분석 JSON 파일 경로 (예: output/강남권_251202_2_location.json)
+        right_file: 권리 분석 JSON 파일 경로 (예: output/강남권_251202_3_right.json)
+        output_file: 저장할 ROI CSV 파일 경로 (예: output/강남권_251202_4_roi.csv)
+    """
+    try:
+        frame = build_frame(_load(listing_file), _load(location_file), _load(right_file))
+        result = compute_roi(frame)
+        result.to_csv(output_file, index=False, encoding="utf-8")
+        record_artifact(output_file, [listing_file, location_file, right_file])
+        return json.dumps({
+            "output_file": output_file,
+            "count": len(result),
+            "grades": result["투자등급"].value_counts().to_dict(),
+            "rows": json.loads(result.to_json(orient="records", force_ascii=False)),
+        }, ensure_ascii=False)
+    except Exception as e:
+        return f"Error in ROI engine: {str(e)}"
@@ -0,0 +1,111 @@
+"""
+로컬 대체 모델
+
+Bedrock을 호출하지 않고 모델 라우팅과 프롬프트 캐시 동작을 확인하기 위한 Strands 모델입니다.
+캐시 지점(cache_prompt/cache_tools)이 설정되어 있으면 시스템 프롬프트와 도구 정의를 캐시 접두부로 보고,
+같은 모델에 같은 접두부가 다시 들어오면 캐시 적중(cacheReadInputTokens), 처음이면 캐시 기록(cacheWriteInputTokens)으로 보고합니다.
+응답은 {"model_id", "cache"} JSON 한 줄이며, 토큰 수는 문자 수 / 3으로 추정합니다.
+"""
+import hashlib
+import json
+import threading
+from typing import Any, AsyncGenerator, Dict, List, Optional
+
+from strands.models import Model
+
+# 프로세스 전체에서 공유하는 캐시 (Bedrock 프롬프트 캐시처럼 같은 모델의 여러 에이전트가 공유)
+_cache: Dict[str, int] = {}
+_stats: Dict[str, Dict[str, int]] = {}
+_lock = threading.Lock()
+
+
+def _tokens(value: Any) -> int:
+    return len(json.dumps(value, ensure_ascii=False, default=str)) // 3
+
+
+def cache_stats() -> Dict[str, Dict[str, int]]:
+    """
+    모델 ID별 호출 수, 캐시 적중/기록 수
+    """
+    with _lock:
+        return {model_id: dict(stats) for model_id, stats in _stats.items()}
+
+
+class StubModel(Model):
+    def __init__(self, **config):
+        """
+        Args:
+            model_id: 보고할 모델 ID
+            cache_prompt: 설정하면 시스템 프롬프트를 캐시 접두부에 포함
+            cache_tools: 설정하면 도구 정의를 캐시 접두부에 포함
+        """
+        self.config = dict(config)
+
+    def update_config(self, **model_config) -> None:
+        self.config.update(model_config)
+
+    def get_config(self) -> Dict[str, Any]:
+        return self.config
+
+    def _cache_prefix(self, tool_specs, system_prompt) -> Optional[List]:
+        prefix = []
+        if self.config.get("cache_tools"):
+            prefix.append(tool_specs or [])
+        if self.config.get("cache_prompt"):
+            prefix.append(system_prompt or "")
+        return prefix or None
+
+    async def stream(
+        self,
+        messages: List[Dict],
+        tool_specs: Optional[List[Dict]] = None,
+        system_prompt: Optional[str] = None,
+        **kwargs,
+    ) -> AsyncGenerator[Dict, None]:
+        model_id = self.config.get("model_id", "stub")
+        prefix = self._cache_prefix(tool_specs, system_prompt)
+        usage = {"inputTokens": _tokens(messages), "cacheReadInputTokens": 0, "cacheWriteInputTokens": 0}
+        cache = "disabled"
+
+        with _lock:
+            stats = _stats.setdefault(model_id, {"calls": 0, "cache_hits": 0, "cache_writes": 0})
+            stats["calls"] += 1
+            if prefix is None:
+                usage["inputTokens"] += _tokens([tool_specs or [], system_prompt or ""])
+            else:
+                key = hashlib.sha256(json.dumps([model_id, prefix], ensure_ascii=False, default=str).encode()).hexdigest()
+                prefix_tokens = _tokens(prefix)
+                if key in _cache:
+                    cache = "hit"
+                    stats["cache_hits"] += 1
+                    usage["cacheReadInputTokens"] = prefix_tokens
+                else:
+                    cache = "write"
+                    stats["cache_writes"] += 1
+                    _cache[key] = prefix_tokens
+                    usage["cacheWriteInputTokens"] = prefix_tokens
+
+        text = json.dumps({"model_id": model_id, "cache": cache})
+        usage["outputTokens"] = _tokens(text)
+        usage["totalTokens"] = usage["inputTokens"] + usage["outputTokens"]
+
+        yield {"messageStart": {"role": "assistant"}}
+        yield {"contentBlockStart": {"start": {}}}
+        yield {"contentBlockDelta": {"delta": {"text": text}}}
+        yield {"contentBlockStop": {}}
+        yield {"messageStop": {"stopReason": "end_turn"}}
+        yield {"metadata": {"usage": usage, "metrics": {"latencyMs": 0}}}
+
+    async def structured_output(self, output_model, prompt, system_prompt=None, **kwargs):
+        """
+        stream()과 같은 응답(캐시 계측 포함)을 보낸 뒤, 응답 JSON 중 output_model에 있는 필드로 출력 객체 생성
+        (나머지 필드는 검증 없이 기본값 사용)
+        """
+        text = ""
+        async for event in self.stream(prompt, system_prompt=system_prompt, **kwargs):
+            text += event.get("contentBlockDelta", {}).get("delta", {}).get("text", "")
+            yield event
+        data = json.loads(text)
+        yield {"output": output_model.model_construct(**{
+            key: value for key, value in data.items() if key in output_model.model_fields
+        })}
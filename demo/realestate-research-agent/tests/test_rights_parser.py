@@ -0,0 +1,54 @@
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from rights_parser import parse_amount, parse_encumbrance, split_segments
+
+
+def test_thousands_separator_and_creditor_commas_stay_in_one_segment():
+    assert split_segments("가압류 5,000만원(주식회사 A, B), 압류 1건") == ["가압류 5,000만원(주식회사 A, B)", "압류 1건"]
+
+
+def test_amount_with_thousands_separator():
+    [record] = parse_encumbrance("가압류 5,000만원(주식회사 A, B)")
+    assert record["right_type"] == "가압류"
+    assert record["amount"] == 50_000_000
+    assert record["creditor"] == "주식회사 A, B"
+    assert record["needs_review"] is False
+
+
+def test_multiple_rights_and_conjunction():
+    records = parse_encumbrance("근저당 12억(신한은행), 가압류 3,000만원 및 압류 2건")
+    assert [r["right_type"] for r in records] == ["근저당", "가압류", "압류"]
+    assert [r["amount"] for r in records[:2]] == [1_200_000_000, 30_000_000]
+    assert records[2]["count"] == 2
+    assert not any(r["right_type"] == "기타" for r in records)
+
+
+def test_conjunction_inside_parentheses_is_not_split():
+    [record] = parse_encumbrance("근저당 9억(국민은행 및 신한은행)")
+    assert record["creditor"] == "국민은행 및 신한은행"
+
+
+def test_unitless_amount_needs_review():
+    [record] = parse_encumbrance("근저당 5000")
+    assert record["amount"] == 5000
+    assert record["needs_review"] is True
+
+
+def test_implausibly_small_amount_needs_review():
+    [record] = parse_encumbrance("가압류 50만원")
+    assert record["amount"] == 500_000
+    assert record["needs_review"] is True
+
+
+def test_absent_right():
+    [record] = parse_encumbrance("전세권 없음")
+    assert record["present"] is False
+    assert record["needs_review"] is False
+
+
+def test_parse_amount():
+    assert parse_amount("3,000만원") == 30_000_000
+    assert parse_amount("2억5천") == 250_000_000
+    assert parse_amount("1.5억") == 150_000_000